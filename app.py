@@ -12,17 +12,12 @@ _project_root = Path(__file__).resolve().parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-import pandas as pd
 import streamlit as st
 
+# The engine (Anthropic SDK, sentence-transformers) and pandas are imported
+# where they are first needed so the page shell renders before they load.
 try:
     from src.matching.config import settings
-    from src.matching.engine import (
-        load_minimal_profiles,
-        load_profiles_from_json,
-        load_sample_profiles,
-        run,
-    )
     from src.matching.models import AttendeeProfile, MatchBriefing
 except Exception as e:
     import traceback
@@ -41,6 +36,10 @@ ROLE_OPTIONS = [
     "seeking_technology", "regulatory_policy", "media_content",
 ]
 
+# Above this many attendees the heatmap is drawn as an image rather than a
+# styled dataframe.
+_STYLED_HEATMAP_MAX = 25
+
 _UPLOAD_HELP = """\
 Upload a JSON array of attendee profiles.  **Minimal format** (5 fields):
 
@@ -66,34 +65,92 @@ Optional enrichment fields: `id`, `company_description`, `ticket_type`,
 # Helpers
 # ---------------------------------------------------------------------------
 
+@st.cache_resource(show_spinner=False)
+def _cached_sample() -> list[AttendeeProfile]:
+    from src.matching.engine import load_sample_profiles
+
+    return load_sample_profiles()
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_minimal() -> list[AttendeeProfile]:
+    from src.matching.engine import load_minimal_profiles
+
+    return load_minimal_profiles()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_upload(raw_bytes: bytes) -> list[AttendeeProfile]:
+    from src.matching.engine import load_profiles_from_json
+
+    return load_profiles_from_json(json.loads(raw_bytes))
+
+
 def _render_profile_preview(
     profiles: list[AttendeeProfile], expanded: bool = True,
 ) -> None:
     for i, p in enumerate(profiles):
         with st.expander(f"{i+1}. {p.name} — {p.title}, {p.company}", expanded=expanded):
+            left = [
+                f"**Name:** {p.name}",
+                f"**Title:** {p.title}",
+                f"**Company:** {p.company}",
+            ]
+            if p.product:
+                left.append(f"**Product:** {p.product}")
+            if p.company_description and p.company_description != p.product:
+                left.append(f"**Description:** {p.company_description}")
+
+            right = [f"**Goal:** {p.stated_goal or p.looking_for or '—'}"]
+            if p.sector:
+                right.append(f"**Sector:** {p.sector}")
+            if p.stage:
+                right.append(f"**Stage:** {p.stage}")
+            if p.funding_raised:
+                right.append(f"**Funding:** {p.funding_raised}")
+            if p.roles_at_event:
+                right.append(f"**Roles:** {', '.join(p.roles_at_event)}")
+            if p.key_facts:
+                right.append(
+                    "**Key facts:**\n" + "\n".join(f"- {f}" for f in p.key_facts)
+                )
+
             cols = st.columns(2)
-            with cols[0]:
-                st.markdown(f"**Name:** {p.name}")
-                st.markdown(f"**Title:** {p.title}")
-                st.markdown(f"**Company:** {p.company}")
-                if p.product:
-                    st.markdown(f"**Product:** {p.product}")
-                if p.company_description and p.company_description != p.product:
-                    st.markdown(f"**Description:** {p.company_description}")
-            with cols[1]:
-                st.markdown(f"**Goal:** {p.stated_goal or p.looking_for or '—'}")
-                if p.sector:
-                    st.markdown(f"**Sector:** {p.sector}")
-                if p.stage:
-                    st.markdown(f"**Stage:** {p.stage}")
-                if p.funding_raised:
-                    st.markdown(f"**Funding:** {p.funding_raised}")
-                if p.roles_at_event:
-                    st.markdown(f"**Roles:** {', '.join(p.roles_at_event)}")
-                if p.key_facts:
-                    st.markdown("**Key facts:**")
-                    for f in p.key_facts:
-                        st.markdown(f"- {f}")
+            cols[0].markdown("\n\n".join(left))
+            cols[1].markdown("\n\n".join(right))
+
+
+def _profile_key(p: AttendeeProfile) -> str:
+    return p.model_dump_json()
+
+
+@st.cache_data(show_spinner=False, hash_funcs={AttendeeProfile: _profile_key})
+def _cached_run(
+    profiles: tuple[AttendeeProfile, ...], skip: bool, explain_top: int,
+) -> list[MatchBriefing]:
+    """Run the engine once per distinct profile set.
+
+    The progress widgets are created inside the cached function so that
+    Streamlit can replay them on a cache hit.
+    """
+    from src.matching.engine import run
+
+    progress_bar = st.progress(0.0)
+    status_text = st.empty()
+
+    def _cb(label: str, frac: float) -> None:
+        progress_bar.progress(min(frac, 1.0))
+        status_text.text(label)
+
+    briefings = run(
+        list(profiles),
+        skip_explanations=skip,
+        progress_callback=_cb,
+        explain_top=explain_top,
+    )
+    progress_bar.progress(1.0)
+    status_text.text("Complete!")
+    return briefings
 
 
 def _run_engine(profiles: list[AttendeeProfile]) -> list[MatchBriefing] | None:
@@ -106,97 +163,165 @@ def _run_engine(profiles: list[AttendeeProfile]) -> list[MatchBriefing] | None:
         return None
 
     skip = st.session_state.get("skip_explanations", False)
-
-    progress_bar = st.progress(0.0)
-    status_text = st.empty()
-
-    def _cb(label: str, frac: float) -> None:
-        progress_bar.progress(min(frac, 1.0))
-        status_text.text(label)
+    explain_top = st.session_state.get("explain_top", settings.top_k)
 
     try:
-        briefings = run(
-            profiles,
-            skip_explanations=skip,
-            progress_callback=_cb,
-        )
-        progress_bar.progress(1.0)
-        status_text.text("Complete!")
-        return briefings
+        return _cached_run(tuple(profiles), skip, explain_top)
     except Exception as e:
         st.error(f"Engine error: {e}")
         return None
 
 
+def _store_briefings(
+    slot: str,
+    profiles: list[AttendeeProfile],
+    briefings: list[MatchBriefing] | None,
+) -> None:
+    """Keep the last result per tab so incidental reruns can redraw it."""
+    if briefings:
+        key = tuple(_profile_key(p) for p in profiles)
+        st.session_state[f"last_run_{slot}"] = (key, briefings)
+
+
+def _stored_briefings(
+    slot: str, profiles: list[AttendeeProfile],
+) -> list[MatchBriefing] | None:
+    """Return the stored result for *slot* if it was computed for *profiles*."""
+    entry = st.session_state.get(f"last_run_{slot}")
+    if entry is None:
+        return None
+    key, briefings = entry
+    if key != tuple(_profile_key(p) for p in profiles):
+        return None
+    return briefings
+
+
 def _render_briefings(
     briefings: list[MatchBriefing],
     profiles: list[AttendeeProfile],
 ) -> None:
+    import numpy as np
+    import pandas as pd
+
     st.markdown("---")
     st.header("Match Results")
 
+    by_id = {p.id: p for p in profiles}
+
     # Heatmap
     names = [p.name for p in profiles]
-    matrix_data = {name: {n: 0.0 for n in names} for name in names}
+    idx = {p.id: i for i, p in enumerate(profiles)}
+    matrix = np.zeros((len(names), len(names)), dtype=np.float32)
     for b in briefings:
+        row = idx.get(b.attendee_id)
+        if row is None:
+            continue
         for m in b.matches:
-            a_name = b.attendee_name
-            b_profile = next((p for p in profiles if p.id == m.pair.attendee_b_id), None)
-            if b_profile:
-                matrix_data[a_name][b_profile.name] = m.pair.composite
+            col = idx.get(m.pair.attendee_b_id)
+            if col is not None:
+                matrix[row, col] = m.pair.composite
 
-    df = pd.DataFrame(matrix_data, index=names, columns=names)
+    df = pd.DataFrame(matrix, index=names, columns=names)
     st.subheader("Match Matrix Heatmap")
-    try:
-        styled = df.style.background_gradient(cmap="YlOrRd", vmin=0, vmax=1).format("{:.2f}")
-        st.dataframe(styled, use_container_width=True)
-    except ImportError:
-        st.dataframe(df.round(2), use_container_width=True)
+    if len(names) <= _STYLED_HEATMAP_MAX:
+        try:
+            styled = df.style.background_gradient(cmap="YlOrRd", vmin=0, vmax=1).format("{:.2f}")
+            st.dataframe(styled, use_container_width=True)
+        except ImportError:
+            st.dataframe(df.round(2), use_container_width=True)
+    else:
+        # A styled dataframe ships N^2 styled HTML cells; an image is one blit.
+        # Figure() directly rather than pyplot: pyplot's global figure
+        # registry is not safe across concurrent sessions.
+        from matplotlib.figure import Figure
+
+        n = len(names)
+        fig = Figure(figsize=(max(6, n * 0.25), max(5, n * 0.25)))
+        ax = fig.subplots()
+        im = ax.imshow(matrix, cmap="YlOrRd", vmin=0, vmax=1)
+        ax.set_xticks(range(n), names, rotation=90, fontsize=7)
+        ax.set_yticks(range(n), names, fontsize=7)
+        fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+        fig.tight_layout()
+        st.pyplot(fig)
 
     # Per-attendee briefings
     st.subheader("Individual Briefings")
     for briefing in briefings:
-        with st.expander(f"**{briefing.attendee_name}** — Top {len(briefing.matches)} Matches"):
-            for rank, match in enumerate(briefing.matches, 1):
-                other = next(
-                    (p for p in profiles if p.id == match.pair.attendee_b_id),
-                    None,
-                )
-                if not other:
-                    continue
+        _render_briefing(briefing, by_id)
+
+
+def _render_briefing(
+    briefing: MatchBriefing, by_id: dict[str, AttendeeProfile],
+) -> None:
+    with st.expander(f"**{briefing.attendee_name}** — Top {len(briefing.matches)} Matches"):
+        for rank, match in enumerate(briefing.matches, 1):
+            other = by_id.get(match.pair.attendee_b_id)
+            if not other:
+                continue
+
+            st.markdown(f"#### #{rank}: {other.name} — {other.title}, {other.company}")
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Composite", f"{match.pair.composite:.2f}")
+            col2.metric("Complementarity", f"{match.pair.scores.complementarity:.2f}")
+            col3.metric("Transaction-Ready", f"{match.pair.scores.transaction_readiness:.2f}")
+            col4.metric("Non-Obvious", f"{match.pair.scores.non_obvious:.2f}")
 
-                st.markdown(f"#### #{rank}: {other.name} — {other.title}, {other.company}")
+            if match.pair.transaction_type:
+                st.caption(f"Transaction type: **{match.pair.transaction_type.replace('_', ' ').title()}**")
 
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("Composite", f"{match.pair.composite:.2f}")
-                col2.metric("Complementarity", f"{match.pair.scores.complementarity:.2f}")
-                col3.metric("Transaction-Ready", f"{match.pair.scores.transaction_readiness:.2f}")
-                col4.metric("Non-Obvious", f"{match.pair.scores.non_obvious:.2f}")
+            # Dimension one-liners
+            dim = match.dimension_explanations
+            one_liners = []
+            if dim.complementarity:
+                one_liners.append(f"**Complementarity:** {_safe(dim.complementarity)}")
+            if dim.transaction_readiness:
+                one_liners.append(f"**Readiness:** {_safe(dim.transaction_readiness)}")
+            if dim.non_obvious:
+                one_liners.append(f"**Non-obvious:** {_safe(dim.non_obvious)}")
+            if one_liners:
+                st.markdown("\n\n".join(one_liners))
 
-                if match.pair.transaction_type:
-                    st.caption(f"Transaction type: **{match.pair.transaction_type.replace('_', ' ').title()}**")
+            # Main explanation
+            if match.explanation and match.explanation != "(explanations skipped)":
+                st.info(_safe(match.explanation))
 
-                # Dimension one-liners
-                dim = match.dimension_explanations
-                if dim.complementarity or dim.transaction_readiness or dim.non_obvious:
-                    dcol1, dcol2, dcol3 = st.columns(3)
-                    if dim.complementarity:
-                        dcol1.markdown(f"**Complementarity:** {_safe(dim.complementarity)}")
-                    if dim.transaction_readiness:
-                        dcol2.markdown(f"**Readiness:** {_safe(dim.transaction_readiness)}")
-                    if dim.non_obvious:
-                        dcol3.markdown(f"**Non-obvious:** {_safe(dim.non_obvious)}")
+            st.markdown("---")
 
-                # Main explanation
-                if match.explanation and match.explanation != "(explanations skipped)":
-                    st.info(_safe(match.explanation))
 
-                st.markdown("---")
+_SAFE_TABLE = str.maketrans({"$": r"\$"})
 
 
 def _safe(text: str) -> str:
     """Escape dollar signs to prevent Streamlit LaTeX rendering."""
-    return text.replace("$", r"\$")
+    return text.translate(_SAFE_TABLE)
+
+
+@st.fragment
+def _render_builder_list() -> None:
+    """Builder profile list; Remove/Run/Clear only rerun this fragment."""
+    if not st.session_state.builder_profiles:
+        return
+
+    st.markdown(f"**{len(st.session_state.builder_profiles)} profiles added:**")
+    for i, p in enumerate(st.session_state.builder_profiles):
+        cols = st.columns([4, 1])
+        cols[0].markdown(f"{i+1}. **{p.name}** — {p.title}, {p.company}")
+        if cols[1].button("Remove", key=f"rm_{i}"):
+            st.session_state.builder_profiles.pop(i)
+            st.rerun(scope="fragment")
+
+    profiles = st.session_state.builder_profiles
+    col_run, col_clear = st.columns(2)
+    if col_run.button("Run Matching Engine", key="run_builder", type="primary"):
+        _store_briefings("builder", profiles, _run_engine(profiles))
+    if col_clear.button("Clear All", key="clear_builder"):
+        st.session_state.builder_profiles = []
+        st.rerun(scope="fragment")
+    briefings = _stored_briefings("builder", profiles)
+    if briefings:
+        _render_briefings(briefings, profiles)
 
 
 # ---------------------------------------------------------------------------
@@ -208,6 +333,11 @@ with st.sidebar:
     st.session_state["skip_explanations"] = st.checkbox(
         "Skip explanations (fast mode)", value=False,
     )
+    st.session_state["explain_top"] = st.slider(
+        "Explain top-N per attendee", 0, settings.top_k, 1,
+        disabled=st.session_state["skip_explanations"],
+        help="Only the N best matches per attendee get an LLM explanation.",
+    )
     st.markdown("---")
     st.caption("API key is loaded from `.env` file.")
     if settings.anthropic_api_key:
@@ -233,36 +363,43 @@ with tab_sample:
         horizontal=True,
     )
     if profile_set.startswith("Detailed"):
-        profiles = load_sample_profiles()
+        profiles = _cached_sample()
     else:
-        profiles = load_minimal_profiles()
+        profiles = _cached_minimal()
 
     _render_profile_preview(profiles, expanded=True)
 
     if st.button("Run Matching Engine", key="run_sample", type="primary"):
-        briefings = _run_engine(profiles)
-        if briefings:
-            _render_briefings(briefings, profiles)
+        _store_briefings("sample", profiles, _run_engine(profiles))
+    briefings = _stored_briefings("sample", profiles)
+    if briefings:
+        _render_briefings(briefings, profiles)
 
 
 # --- Tab 2: Upload JSON ---
 with tab_upload:
     st.subheader("Upload custom profiles")
     st.markdown(_UPLOAD_HELP)
-    uploaded = st.file_uploader("Upload JSON", type=["json"])
-    if uploaded:
+    with st.form("upload_form"):
+        uploaded = st.file_uploader("Upload JSON", type=["json"])
+        run_upload = st.form_submit_button("Load & Run", type="primary")
+
+    if run_upload and uploaded:
         try:
-            raw = json.loads(uploaded.read())
-            profiles = load_profiles_from_json(raw)
-            st.success(f"Loaded {len(profiles)} profiles")
-            _render_profile_preview(profiles, expanded=True)
-
-            if st.button("Run Matching Engine", key="run_upload", type="primary"):
-                briefings = _run_engine(profiles)
-                if briefings:
-                    _render_briefings(briefings, profiles)
+            profiles = _cached_upload(uploaded.getvalue())
         except Exception as e:
             st.error(f"Error loading JSON: {e}")
+        else:
+            st.session_state["upload_profiles"] = profiles
+            _store_briefings("upload", profiles, _run_engine(profiles))
+
+    profiles = st.session_state.get("upload_profiles")
+    if profiles:
+        st.success(f"Loaded {len(profiles)} profiles")
+        _render_profile_preview(profiles, expanded=True)
+        briefings = _stored_briefings("upload", profiles)
+        if briefings:
+            _render_briefings(briefings, profiles)
 
 
 # --- Tab 3: Interactive Builder ---
@@ -332,20 +469,4 @@ with tab_builder:
                 st.session_state.builder_profiles.append(profile)
                 st.success(f"Added {name}. Total: {len(st.session_state.builder_profiles)}")
 
-    if st.session_state.builder_profiles:
-        st.markdown(f"**{len(st.session_state.builder_profiles)} profiles added:**")
-        for i, p in enumerate(st.session_state.builder_profiles):
-            cols = st.columns([4, 1])
-            cols[0].markdown(f"{i+1}. **{p.name}** — {p.title}, {p.company}")
-            if cols[1].button("Remove", key=f"rm_{i}"):
-                st.session_state.builder_profiles.pop(i)
-                st.rerun()
-
-        col_run, col_clear = st.columns(2)
-        if col_run.button("Run Matching Engine", key="run_builder", type="primary"):
-            briefings = _run_engine(st.session_state.builder_profiles)
-            if briefings:
-                _render_briefings(briefings, st.session_state.builder_profiles)
-        if col_clear.button("Clear All", key="clear_builder"):
-            st.session_state.builder_profiles = []
-            st.rerun()
+    _render_builder_list()
@@ -0,0 +1,80 @@
+"""Bounded in-process caches shared by the embedding and extraction layers.
+
+Also hosts the optional on-disk tier (``settings.cache_dir``) that lets
+extraction results and embeddings survive a restart.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Generic, Hashable, TypeVar
+
+from src.matching.config import settings
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Least-recently-used mapping capped at ``maxsize`` entries.
+
+    Safe to share across the engine's worker threads; every operation is
+    O(1) and holds the lock only for the dict update.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+@lru_cache(maxsize=None)
+def disk_cache(name: str) -> Any | None:
+    """Return the persistent cache *name*, or None when disabled.
+
+    Requires ``settings.cache_dir`` and the optional ``diskcache`` extra
+    (``pip install ".[cache]"``); without either, callers fall back to the
+    in-process caches alone.
+    """
+    if settings.cache_dir is None:
+        return None
+    try:
+        import diskcache
+    except ImportError:
+        logger.warning("cache_dir is set but diskcache is not installed; disk cache disabled")
+        return None
+    return diskcache.Cache(str(Path(settings.cache_dir) / name))
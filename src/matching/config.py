@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
-class DimensionWeights(BaseModel):
-    complementarity: float = Field(default=0.50, ge=0.0, le=1.0)
-    transaction_readiness: float = Field(default=0.30, ge=0.0, le=1.0)
-    non_obvious: float = Field(default=0.20, ge=0.0, le=1.0)
+@dataclass(frozen=True)
+class DimensionWeights:
+    complementarity: float = 0.50
+    transaction_readiness: float = 0.30
+    non_obvious: float = 0.20
+
+    def __post_init__(self) -> None:
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{f.name} weight must be in [0, 1], got {value}")
 
 
-class ComplementarityWeights(BaseModel):
+@dataclass(frozen=True)
+class ComplementarityWeights:
     needs_provides_alignment: float = 0.50
     value_chain_adjacency: float = 0.30
     bidirectional_multiplier: float = 0.20
@@ -23,15 +36,45 @@ class Settings(BaseSettings):
     anthropic_model: str = "claude-sonnet-4-20250514"
     anthropic_fast_model: str = "claude-3-haiku-20240307"
 
-    dimension_weights: DimensionWeights = DimensionWeights()
-    complementarity_weights: ComplementarityWeights = ComplementarityWeights()
+    dimension_weights: DimensionWeights = Field(default_factory=DimensionWeights)
+    complementarity_weights: ComplementarityWeights = Field(
+        default_factory=ComplementarityWeights,
+    )
 
     bidirectional_threshold: float = 0.3
     bidirectional_boost: float = 1.3
 
+    # Cross-sector boost for the TF-IDF non-obvious variant
+    novelty_similarity_threshold: float = 0.5
+    novelty_boost: float = 1.25
+
     top_k: int = 4
 
+    extraction_concurrency: int = 8
+    explanation_concurrency: int = 6
+
+    # "onnx" needs the optional extra: pip install ".[onnx]"
+    embedding_backend: Literal["torch", "onnx"] = "torch"
+    embedding_onnx_file: str = "onnx/model_quint8_avx2.onnx"
+    embeddings_cache_maxsize: int = 50_000
+    embedding_quantize: bool = False
+    # "cuda" runs the all-pairs similarity GEMMs on the GPU via torch when
+    # one is available; falls back to NumPy otherwise.
+    similarity_device: Literal["cpu", "cuda"] = "cpu"
+    extraction_cache_maxsize: int = 10_000
+
+    # Persist extraction results and embeddings across runs; needs the
+    # optional extra: pip install ".[cache]"
+    cache_dir: Path | None = None
+    anthropic_max_retries: int = 4
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance (env is parsed once)."""
+    return Settings()
+
+
+settings = get_settings()
@@ -7,6 +7,11 @@ different event vertical.
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+
+import numpy as np
+
 # ---------------------------------------------------------------------------
 # Layer 1 — Value Chain Map
 # ---------------------------------------------------------------------------
@@ -133,17 +138,34 @@ def position_tags(chain: str, position: str) -> set[str]:
     return POSITION_TAGS.get(f"{chain}/{position}", set())
 
 
+# Problem domains as bits of an int, so tag-set algebra is bitwise.
+_DOMAIN_NAMES: list[str] = sorted(ALL_PROBLEM_DOMAINS)
+_DOMAIN_BIT: dict[str, int] = {d: 1 << i for i, d in enumerate(_DOMAIN_NAMES)}
+_POSITION_MASK: dict[str, int] = {
+    pos: sum(_DOMAIN_BIT[t] for t in tags) for pos, tags in POSITION_TAGS.items()
+}
+
+
+def _tags_mask(positions: list[tuple[str, str]]) -> int:
+    mask = 0
+    for chain, pos in positions:
+        mask |= _POSITION_MASK.get(f"{chain}/{pos}", 0)
+    return mask
+
+
+def _mask_tags(mask: int) -> set[str]:
+    return {d for d in _DOMAIN_NAMES if mask & _DOMAIN_BIT[d]}
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
 def shared_problem_domains(
     positions_a: list[tuple[str, str]],
     positions_b: list[tuple[str, str]],
 ) -> set[str]:
-    tags_a: set[str] = set()
-    for chain, pos in positions_a:
-        tags_a.update(position_tags(chain, pos))
-    tags_b: set[str] = set()
-    for chain, pos in positions_b:
-        tags_b.update(position_tags(chain, pos))
-    return tags_a & tags_b
+    return _mask_tags(_tags_mask(positions_a) & _tags_mask(positions_b))
 
 
 def non_obvious_tag_score(
@@ -157,55 +179,75 @@ def non_obvious_tag_score(
     Returns (score, shared_tags).  Higher when positions share problem
     domains across different sectors.
     """
-    shared = shared_problem_domains(positions_a, positions_b)
-    if not shared:
-        return 0.0, shared
-
-    tags_a: set[str] = set()
-    for chain, pos in positions_a:
-        tags_a.update(position_tags(chain, pos))
-    tags_b: set[str] = set()
-    for chain, pos in positions_b:
-        tags_b.update(position_tags(chain, pos))
-
-    union = tags_a | tags_b
-    jaccard = len(shared) / len(union) if union else 0.0
-    base = jaccard
-
     different_sectors = (
         sector_a is not None
         and sector_b is not None
         and sector_a != sector_b
     )
+    base, shared = _non_obvious_tag_score(
+        tuple(positions_a), tuple(positions_b), different_sectors,
+    )
+    return base, set(shared)
+
+
+@lru_cache(maxsize=4096)
+def _non_obvious_tag_score(
+    positions_a: tuple[tuple[str, str], ...],
+    positions_b: tuple[tuple[str, str], ...],
+    different_sectors: bool,
+) -> tuple[float, frozenset[str]]:
+    mask_a = _tags_mask(positions_a)
+    mask_b = _tags_mask(positions_b)
+    shared = mask_a & mask_b
+    if not shared:
+        return 0.0, frozenset()
+
+    base = _popcount(shared) / _popcount(mask_a | mask_b)
     if different_sectors:
         base = min(base * 1.5, 1.0)
 
-    return base, shared
+    return base, frozenset(_mask_tags(shared))
+
+
+def sector_ids(sectors: list[str | None]) -> np.ndarray:
+    """(N,) int32 sector codes in first-seen order; -1 where unknown."""
+    codes: dict[str, int] = {}
+    return np.array(
+        [-1 if s is None else codes.setdefault(s, len(codes)) for s in sectors],
+        dtype=np.int32,
+    )
+
+
+def tag_score_matrix(
+    position_lists: list[list[tuple[str, str]]],
+    sector_id: np.ndarray,
+) -> np.ndarray:
+    """(N, N) float32 matrix of non_obvious_tag_score for all pairs.
+
+    Tag sets become rows of a 0/1 incidence matrix, so shared-tag counts
+    for every pair are one matmul and union sizes follow from row sums.
+    ``sector_id`` holds the codes from sector_ids().
+    """
+    bits = np.arange(len(_DOMAIN_NAMES))
+    masks = np.array([_tags_mask(p) for p in position_lists], dtype=np.int64)
+    incidence = ((masks[:, None] >> bits) & 1).astype(np.float32)
+    shared = incidence @ incidence.T
+    counts = incidence.sum(axis=1)
+    union = counts[:, None] + counts[None, :] - shared
+    score = np.divide(shared, union, out=np.zeros_like(shared), where=shared > 0)
+
+    different = sector_id[:, None] != sector_id[None, :]
+    different &= (sector_id >= 0)[:, None] & (sector_id >= 0)[None, :]
+    boosted = np.minimum(score * 1.5, 1.0)
+    np.copyto(score, boosted, where=different)
+    return score
 
 
 # ---------------------------------------------------------------------------
 # Value chain adjacency
 # ---------------------------------------------------------------------------
 
-def value_chain_adjacency_score(
-    chain_a: str, pos_a: str, chain_b: str, pos_b: str,
-) -> float:
-    if chain_a != chain_b:
-        tags_a = position_tags(chain_a, pos_a)
-        tags_b = position_tags(chain_b, pos_b)
-        if not tags_a or not tags_b:
-            return 0.3
-        overlap = len(tags_a & tags_b)
-        if overlap >= 2:
-            return 0.8
-        if overlap == 1:
-            return 0.5
-        return 0.2
-
-    positions = _POSITION_INDEX.get(chain_a)
-    if positions is None or pos_a not in positions or pos_b not in positions:
-        return 0.3
-    distance = abs(positions[pos_a] - positions[pos_b])
+def _distance_score(distance: int) -> float:
     if distance == 0:
         return 0.2
     if distance == 1:
@@ -215,9 +257,56 @@ def value_chain_adjacency_score(
     return 0.3
 
 
+# Same-chain scores for every (pos_a, pos_b) pair, computed once at import.
+_POSITION_PAIR_SCORE: dict[str, dict[tuple[str, str], float]] = {
+    chain: {
+        (pos_a, pos_b): _distance_score(abs(idx[pos_a] - idx[pos_b]))
+        for pos_a in idx
+        for pos_b in idx
+    }
+    for chain, idx in _POSITION_INDEX.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def _cross_chain_score(
+    chain_a: str, pos_a: str, chain_b: str, pos_b: str,
+) -> float:
+    tags_a = position_tags(chain_a, pos_a)
+    tags_b = position_tags(chain_b, pos_b)
+    if not tags_a or not tags_b:
+        return 0.3
+    overlap = len(tags_a & tags_b)
+    if overlap >= 2:
+        return 0.8
+    if overlap == 1:
+        return 0.5
+    return 0.2
+
+
+def value_chain_adjacency_score(
+    chain_a: str, pos_a: str, chain_b: str, pos_b: str,
+) -> float:
+    if chain_a != chain_b:
+        return _cross_chain_score(chain_a, pos_a, chain_b, pos_b)
+
+    pair_scores = _POSITION_PAIR_SCORE.get(chain_a)
+    if pair_scores is None:
+        return 0.3
+    return pair_scores.get((pos_a, pos_b), 0.3)
+
+
 def best_chain_score(
     positions_a: list[tuple[str, str]],
     positions_b: list[tuple[str, str]],
+) -> float:
+    return _best_chain_score(tuple(positions_a), tuple(positions_b))
+
+
+@lru_cache(maxsize=4096)
+def _best_chain_score(
+    positions_a: tuple[tuple[str, str], ...],
+    positions_b: tuple[tuple[str, str], ...],
 ) -> float:
     if not positions_a or not positions_b:
         return 0.3
@@ -225,11 +314,31 @@ def best_chain_score(
     for chain_a, pos_a in positions_a:
         for chain_b, pos_b in positions_b:
             s = value_chain_adjacency_score(chain_a, pos_a, chain_b, pos_b)
+            if s >= 1.0:
+                return 1.0
             if s > best:
                 best = s
     return best
 
 
+def chain_score_matrix(position_lists: list[list[tuple[str, str]]]) -> np.ndarray:
+    """(N, N) float32 matrix of best_chain_score for all pairs.
+
+    Scored once per pair of *unique* position sets (a handful per event),
+    then scattered by index.
+    """
+    unique: dict[tuple[tuple[str, str], ...], int] = {}
+    inverse = np.array(
+        [unique.setdefault(tuple(p), len(unique)) for p in position_lists],
+        dtype=np.intp,
+    )
+    table = np.array(
+        [[_best_chain_score(pa, pb) for pb in unique] for pa in unique],
+        dtype=np.float32,
+    ).reshape(len(unique), len(unique))
+    return table[np.ix_(inverse, inverse)]
+
+
 # ---------------------------------------------------------------------------
 # Layer 2 — Role-Transaction Compatibility Matrix
 # ---------------------------------------------------------------------------
@@ -293,6 +402,26 @@ ROLE_TRANSACTION_MATRIX: dict[tuple[str, str], str | None] = {
 }
 
 
+ALL_ROLES: list[str] = list(dict.fromkeys(ra for ra, _ in ROLE_TRANSACTION_MATRIX))
+_ROLE_IDX: dict[str, int] = {role: i for i, role in enumerate(ALL_ROLES)}
+
+# Transaction types interned as small ints; code 0 means "no transaction".
+TX_NAMES: list[str | None] = [
+    None,
+    *dict.fromkeys(tx for tx in ROLE_TRANSACTION_MATRIX.values() if tx is not None),
+]
+TX_CODES: dict[str, int] = {tx: i for i, tx in enumerate(TX_NAMES) if tx is not None}
+
+TX_TABLE: np.ndarray = np.zeros((len(ALL_ROLES), len(ALL_ROLES)), dtype=np.int8)
+for (_ra, _rb), _tx in ROLE_TRANSACTION_MATRIX.items():
+    if _tx is not None:
+        TX_TABLE[_ROLE_IDX[_ra], _ROLE_IDX[_rb]] = TX_CODES[_tx]
+
+# Plain-list rows for scalar lookups; indexing a tiny ndarray from Python is
+# slower than indexing a list.
+_TX_ROWS: list[list[int]] = TX_TABLE.tolist()
+
+
 def get_transaction_type(role_a: str, role_b: str) -> str | None:
     return ROLE_TRANSACTION_MATRIX.get((role_a, role_b))
 
@@ -300,12 +429,74 @@ def get_transaction_type(role_a: str, role_b: str) -> str | None:
 def best_transaction_type(
     roles_a: list[str], roles_b: list[str],
 ) -> str | None:
-    """Find the highest-value transaction type across all role combinations."""
+    """Find the highest-value transaction type across all role combinations.
+
+    Roles are tried in ALL_ROLES order (capital first, "other" last), so
+    the first hit is the best one regardless of how the profile lists them.
+    """
+    return _best_transaction_type(
+        tuple(sorted(roles_a, key=_role_priority)),
+        tuple(sorted(roles_b, key=_role_priority)),
+    )
+
+
+def _build_tx_by_mask() -> np.ndarray:
+    # Every subset of ALL_ROLES is a bitmask; the best transaction for a
+    # pair of subsets is the first non-null TX_TABLE cell in priority order
+    # (role_a, then role_b).  Writing cells lowest-priority first lets the
+    # best one overwrite the rest.
+    masks = np.arange(1 << len(ALL_ROLES))
+    has_role = [(masks >> r) & 1 == 1 for r in range(len(ALL_ROLES))]
+    table = np.zeros((masks.size, masks.size), dtype=np.int8)
+    for ra in reversed(range(len(ALL_ROLES))):
+        for rb in reversed(range(len(ALL_ROLES))):
+            code = TX_TABLE[ra, rb]
+            if code:
+                table[np.ix_(has_role[ra], has_role[rb])] = code
+    return table
+
+
+TX_BY_MASK: np.ndarray = _build_tx_by_mask()
+
+
+def role_mask(roles: list[str]) -> int:
+    """Bitmask of *roles* over ALL_ROLES; unknown roles are ignored."""
+    mask = 0
+    for role in roles:
+        i = _ROLE_IDX.get(role)
+        if i is not None:
+            mask |= 1 << i
+    return mask
+
+
+def transaction_matrix(role_lists: list[list[str]]) -> np.ndarray:
+    """(N, N) int8 matrix of transaction codes (see TX_NAMES) for all pairs.
+
+    Each profile's roles collapse to a bitmask, so the whole matrix is one
+    fancy index into the precomputed TX_BY_MASK table.
+    """
+    masks = np.array([role_mask(roles) for roles in role_lists], dtype=np.intp)
+    return TX_BY_MASK[masks[:, None], masks[None, :]]
+
+
+def _role_priority(role: str) -> int:
+    return _ROLE_IDX.get(role, len(ALL_ROLES))
+
+
+@lru_cache(maxsize=4096)
+def _best_transaction_type(
+    roles_a: tuple[str, ...], roles_b: tuple[str, ...],
+) -> str | None:
+    idx_b = [_ROLE_IDX[rb] for rb in roles_b if rb in _ROLE_IDX]
     for ra in roles_a:
-        for rb in roles_b:
-            tx = ROLE_TRANSACTION_MATRIX.get((ra, rb))
-            if tx is not None:
-                return tx
+        i = _ROLE_IDX.get(ra)
+        if i is None:
+            continue
+        row = _TX_ROWS[i]
+        for j in idx_b:
+            code = row[j]
+            if code:
+                return TX_NAMES[code]
     return None
 
 
@@ -352,6 +543,27 @@ def stage_compatibility(
     return rules.get((stage_a, stage_b), 0.5)
 
 
+# Dense form of STAGE_RULES for the matrix path: STAGE_CUBE[tx_code, sa, sb]
+# with stages interned by stage_index().  The last index stands for every
+# stage no rule mentions (and for a missing stage), which scores 0.5.
+STAGE_NAMES: list[str] = sorted(
+    {stage for rules in STAGE_RULES.values() for pair in rules for stage in pair},
+)
+_STAGE_IDX: dict[str, int] = {stage: i for i, stage in enumerate(STAGE_NAMES)}
+_OTHER_STAGE = len(STAGE_NAMES)
+
+STAGE_CUBE: np.ndarray = np.full(
+    (len(TX_NAMES), _OTHER_STAGE + 1, _OTHER_STAGE + 1), 0.5, dtype=np.float32,
+)
+for _code, _tx in enumerate(TX_NAMES):
+    for (_sa, _sb), _score in STAGE_RULES.get(_tx, {}).items():
+        STAGE_CUBE[_code, _STAGE_IDX[_sa], _STAGE_IDX[_sb]] = _score
+
+
+def stage_index(stage: str | None) -> int:
+    return _STAGE_IDX.get(stage, _OTHER_STAGE) if stage else _OTHER_STAGE
+
+
 # ---------------------------------------------------------------------------
 # Deterministic inference helpers
 # ---------------------------------------------------------------------------
@@ -365,17 +577,37 @@ _TITLE_SENIORITY: dict[str, float] = {
 }
 
 
+def _keyword_re(*keywords: str) -> re.Pattern[str]:
+    """Compile a plain-substring alternation over *keywords*."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# _TITLE_SENIORITY is ordered by precedence: the first keyword (in dict
+# order) found anywhere in the title wins, e.g. "senior partner" scores as
+# "partner".  The lookahead makes matches overlap so a keyword hidden inside
+# a longer one ("president" in "vice president") is still seen.
+_TITLE_RANK: dict[str, int] = {kw: i for i, kw in enumerate(_TITLE_SENIORITY)}
+_TITLE_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _TITLE_SENIORITY)) + "))",
+)
+
+
+@lru_cache(maxsize=1024)
 def infer_mandate_score(title: str) -> float:
-    title_lower = title.lower()
-    for keyword, score in _TITLE_SENIORITY.items():
-        if keyword in title_lower:
-            return score
-    return 0.5
+    hits = [m.group(1) for m in _TITLE_RE.finditer(title.lower())]
+    if not hits:
+        return 0.5
+    return _TITLE_SENIORITY[min(hits, key=_TITLE_RANK.__getitem__)]
 
 
 def infer_maturity_score(
     key_facts: list[str] | None, stage: str | None,
 ) -> float:
+    return _maturity_score(tuple(key_facts) if key_facts else (), stage)
+
+
+@lru_cache(maxsize=1024)
+def _maturity_score(key_facts: tuple[str, ...], stage: str | None) -> float:
     score = 0.5
     if stage:
         stage_l = stage.lower()
@@ -395,21 +627,37 @@ def infer_maturity_score(
     return min(max(score, 0.0), 1.0)
 
 
+_CAPITAL_RE = _keyword_re("fund", "invest", "capital", "wealth", "allocat")
+_CUSTODY_RE = _keyword_re("custod", "settlement", "clearing")
+_INFRA_RE = _keyword_re("l2", "layer", "scaling", "protocol", "infrastructure")
+_REGULATORY_RE = _keyword_re("regulat", "policy", "compliance", "central bank", "cbdc")
+_VENTURE_RE = _keyword_re("venture", "vc", "gp", "general partner")
+
+_INSTITUTIONAL_RE = _keyword_re("bank", "institution", "sovereign")
+_STARTUP_RE = _keyword_re("startup", "founder", "ceo")
+_REGULATOR_RE = _keyword_re("regulat", "policy", "government")
+
+_EUROPE_RE = _keyword_re("europe", "eu", "mica", "german", "french")
+_MIDDLE_EAST_RE = _keyword_re("middle east", "abu dhabi", "dubai", "saudi")
+_APAC_RE = _keyword_re("asia", "apac", "singapore", "japan", "korea")
+_NORTH_AMERICA_RE = _keyword_re("us", "america", "new york")
+
+
 def infer_capability(title: str, company_desc: str | None) -> str:
     parts = [title]
     if company_desc:
         parts.append(company_desc)
     text = " ".join(parts).lower()
 
-    if any(w in text for w in ("fund", "invest", "capital", "wealth", "allocat")):
+    if _CAPITAL_RE.search(text):
         return "capital_deployment"
-    if any(w in text for w in ("custod", "settlement", "clearing")):
+    if _CUSTODY_RE.search(text):
         return "custody_settlement"
-    if any(w in text for w in ("l2", "layer", "scaling", "protocol", "infrastructure")):
+    if _INFRA_RE.search(text):
         return "blockchain_infrastructure"
-    if any(w in text for w in ("regulat", "policy", "compliance", "central bank", "cbdc")):
+    if _REGULATORY_RE.search(text):
         return "regulatory_framework"
-    if any(w in text for w in ("venture", "vc", "gp", "general partner")):
+    if _VENTURE_RE.search(text):
         return "venture_investment"
     return "technology_services"
 
@@ -417,11 +665,11 @@ def infer_capability(title: str, company_desc: str | None) -> str:
 def infer_audience(title: str, company_desc: str | None) -> list[str]:
     text = f"{title} {company_desc or ''}".lower()
     audiences: list[str] = []
-    if any(w in text for w in ("bank", "institution", "sovereign")):
+    if _INSTITUTIONAL_RE.search(text):
         audiences.append("institutional_investors")
-    if any(w in text for w in ("startup", "founder", "ceo")):
+    if _STARTUP_RE.search(text):
         audiences.append("startups")
-    if any(w in text for w in ("regulat", "policy", "government")):
+    if _REGULATOR_RE.search(text):
         audiences.append("regulators")
     return audiences or ["general"]
 
@@ -431,12 +679,25 @@ def infer_geographic_reach(company_desc: str | None) -> list[str]:
         return ["global"]
     text = company_desc.lower()
     regions: list[str] = []
-    if any(w in text for w in ("europe", "eu", "mica", "german", "french")):
+    if _EUROPE_RE.search(text):
         regions.append("europe")
-    if any(w in text for w in ("middle east", "abu dhabi", "dubai", "saudi")):
+    if _MIDDLE_EAST_RE.search(text):
         regions.append("middle_east")
-    if any(w in text for w in ("asia", "apac", "singapore", "japan", "korea")):
+    if _APAC_RE.search(text):
         regions.append("apac")
-    if any(w in text for w in ("us", "america", "new york")):
+    if _NORTH_AMERICA_RE.search(text):
         regions.append("north_america")
     return regions or ["global"]
+
+
+def clear_caches() -> None:
+    """Drop memoized domain-model results (bounded, but reset per run)."""
+    for fn in (
+        _non_obvious_tag_score,
+        _cross_chain_score,
+        _best_chain_score,
+        _best_transaction_type,
+        infer_mandate_score,
+        _maturity_score,
+    ):
+        fn.cache_clear()
@@ -6,50 +6,301 @@ Provides pre-encoding via fit() and cached retrieval via get_embedding().
 from __future__ import annotations
 
 import logging
+import threading
+from functools import lru_cache
+from typing import Iterable
 
 import numpy as np
 
+from src.matching.cache import disk_cache
+from src.matching.config import settings
+
 logger = logging.getLogger(__name__)
 
+_ENCODE_BATCH_SIZE = 1024
+_MODEL_NAME = "all-MiniLM-L6-v2"
+
 _model = None
-_cache: dict[str, np.ndarray] = {}
+
+
+class EmbeddingStore:
+    """Embeddings held as rows of one C-contiguous (N, D) matrix.
+
+    ``index`` maps text to row.  Rows are appended in amortised O(1) by
+    doubling capacity.  Past ``maxsize`` rows the least recently read rows
+    are evicted and the survivors compacted; rows named in ``pinned`` are
+    never evicted, so one oversized request may briefly exceed the cap.
+
+    With ``quantize=True`` rows are stored as symmetric int8 with one
+    float32 scale per row, a ~4x smaller footprint; reads dequantize to
+    float32 so the similarity matmul still runs through BLAS.
+
+    Shared by concurrent sessions; every public method holds the lock.
+    """
+
+    def __init__(self, maxsize: int, quantize: bool = False) -> None:
+        self.maxsize = maxsize
+        self.quantize = quantize
+        self._dtype = np.int8 if quantize else np.float32
+        self._lock = threading.Lock()
+        self._clock = 0
+        self._clear()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._buf[:len(self.texts)]
+
+    def __contains__(self, text: object) -> bool:
+        return text in self.index
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def get(self, text: str) -> np.ndarray | None:
+        with self._lock:
+            row = self.index.get(text)
+            if row is None:
+                return None
+            self._touch(row)
+            return self._decode(row)
+
+    def rows(self, texts: list[str]) -> np.ndarray:
+        """Gather *texts* as float32 rows; KeyError if any is not stored."""
+        with self._lock:
+            rows = [self.index[t] for t in texts]
+            self._touch(rows)
+            return self._decode(rows)
+
+    def add(
+        self, texts: list[str], vectors: np.ndarray, pinned: Iterable[str] = (),
+    ) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+        scale = None
+        if self.quantize:
+            peak = np.abs(vectors).max(axis=1)
+            scale = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+            vectors = np.rint(vectors / scale[:, None]).astype(np.int8)
+        with self._lock:
+            fresh = [i for i, t in enumerate(texts) if t not in self.index]
+            if len(fresh) < len(texts):  # another session stored some meanwhile
+                texts = [texts[i] for i in fresh]
+                vectors = vectors[fresh]
+                scale = None if scale is None else scale[fresh]
+            overflow = len(self.texts) + len(texts) - self.maxsize
+            if overflow > 0:
+                self._evict(overflow, keep=set(pinned))
+            start, end = len(self.texts), len(self.texts) + len(texts)
+            if end > self._buf.shape[0] or vectors.shape[1] != self._buf.shape[1]:
+                capacity = max(end, 2 * self._buf.shape[0])
+                head = self._buf[:start] if start else vectors[:0]
+                self._buf = _grow(head, capacity)
+                self._scale = _grow(self._scale[:start], capacity)
+                self._used = _grow(self._used[:start], capacity)
+            self._buf[start:end] = vectors
+            if scale is not None:
+                self._scale[start:end] = scale
+            for row, text in enumerate(texts, start=start):
+                self.index[text] = row
+            self.texts.extend(texts)
+            self._touch(slice(start, end))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self.texts: list[str] = []
+        self.index: dict[str, int] = {}
+        self._buf = np.empty((0, 0), dtype=self._dtype)
+        self._scale = np.empty(0, dtype=np.float32)
+        self._used = np.empty(0, dtype=np.int64)   # last-read tick per row
+
+    def _touch(self, rows) -> None:
+        self._clock += 1
+        self._used[rows] = self._clock
+
+    def _evict(self, count: int, keep: set[str]) -> None:
+        n = len(self.texts)
+        candidates = np.array(
+            [row for row, t in enumerate(self.texts) if t not in keep], dtype=np.intp,
+        )
+        if len(candidates) < count:
+            logger.warning(
+                "Embedding store exceeds maxsize=%d to hold the current request",
+                self.maxsize,
+            )
+        oldest = candidates[np.argsort(self._used[candidates], kind="stable")[:count]]
+        survive = np.ones(n, dtype=bool)
+        survive[oldest] = False
+        # Compact into fresh arrays: rows handed out by get() are views and
+        # must not change underneath their holders.
+        self._buf = _grow(self._buf[:n][survive], self._buf.shape[0])
+        self._scale = _grow(self._scale[:n][survive], self._buf.shape[0])
+        self._used = _grow(self._used[:n][survive], self._buf.shape[0])
+        self.texts = [t for t, s in zip(self.texts, survive) if s]
+        self.index = {t: row for row, t in enumerate(self.texts)}
+
+    def _decode(self, rows) -> np.ndarray:
+        if not self.quantize:
+            return self._buf[rows]
+        scale = self._scale[rows]
+        return self._buf[rows].astype(np.float32) * np.expand_dims(scale, -1)
+
+
+def _grow(a: np.ndarray, capacity: int) -> np.ndarray:
+    """Copy *a* into the head of a new array with ``capacity`` rows."""
+    out = np.zeros((capacity, *a.shape[1:]), dtype=a.dtype)
+    out[:len(a)] = a
+    return out
+
+
+_store = EmbeddingStore(
+    settings.embeddings_cache_maxsize, quantize=settings.embedding_quantize,
+)
 
 
 def _load_model():
     global _model
     if _model is None:
         from sentence_transformers import SentenceTransformer
-        _model = SentenceTransformer("all-MiniLM-L6-v2")
-        logger.info("Loaded sentence-transformer model: all-MiniLM-L6-v2")
+        if settings.embedding_backend == "onnx":
+            _model = SentenceTransformer(
+                _MODEL_NAME,
+                backend="onnx",
+                model_kwargs={"file_name": settings.embedding_onnx_file},
+            )
+        else:
+            _model = SentenceTransformer(_MODEL_NAME)
+        logger.info(
+            "Loaded sentence-transformer model: %s (%s backend)",
+            _MODEL_NAME, settings.embedding_backend,
+        )
     return _model
 
 
+def _disk_key(text: str) -> str:
+    model = _MODEL_NAME
+    if settings.embedding_backend == "onnx":
+        model = f"{model}/{settings.embedding_onnx_file}"
+    return f"{model}:{settings.embedding_backend}:{text}"
+
+
+def _encode(texts: list[str]) -> np.ndarray:
+    return _load_model().encode(
+        texts,
+        batch_size=_ENCODE_BATCH_SIZE,
+        show_progress_bar=False,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    ).astype(np.float32, copy=False)
+
+
 def fit(texts: list[str]) -> None:
-    """Pre-encode a corpus of texts for fast cached retrieval."""
-    model = _load_model()
-    _cache.clear()
-    vectors = model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
-    for text, vec in zip(texts, vectors):
-        _cache[text] = vec
-    logger.info("Pre-encoded %d texts (%d-dim embeddings)", len(texts), vectors.shape[1])
+    """Pre-encode a corpus of texts for fast cached retrieval.
+
+    Duplicates are encoded once; sentence-transformers length-sorts each
+    batch internally, so one large batch keeps padding waste low.  With a
+    disk cache configured, only texts never seen before are encoded.
+    """
+    _store.reset()
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return
+
+    disk = disk_cache("embeddings")
+    found: dict[str, np.ndarray] = {}
+    if disk is not None:
+        for text in unique:
+            raw = disk.get(_disk_key(text))
+            if raw is not None:
+                found[text] = np.frombuffer(raw, dtype=np.float32)
+
+    missing = [t for t in unique if t not in found]
+    if missing:
+        vectors = _encode(missing)
+        for text, vec in zip(missing, vectors):
+            found[text] = vec
+            if disk is not None:
+                disk.set(_disk_key(text), vec.tobytes())
+
+    _store.add(unique, np.stack([found[t] for t in unique]))
+    logger.info(
+        "Pre-encoded %d texts (%d from disk cache)",
+        len(unique), len(unique) - len(missing),
+    )
 
 
 def get_embedding(text: str) -> np.ndarray:
-    if text in _cache:
-        return _cache[text]
+    vec = _store.get(text)
+    if vec is not None:
+        return vec
+    logger.debug("Embedding cache miss; encoding on demand: %.60s", text)
     model = _load_model()
     vec = model.encode(text, show_progress_bar=False, normalize_embeddings=True)
-    _cache[text] = vec
-    return vec
+    _store.add([text], vec, pinned=[text])
+    stored = _store.get(text)
+    # A concurrent session may evict the row before it is read back.
+    return np.asarray(vec, dtype=np.float32) if stored is None else stored
+
+
+def get_matrix(texts: list[str]) -> np.ndarray:
+    """Gather the embeddings of *texts* into an (N, D) float32 array.
+
+    Texts not seen by fit() are encoded together in one batched call.  The
+    result is C-ordered so each row streams contiguously through the GEMMs.
+    """
+    while True:
+        missing = [t for t in dict.fromkeys(texts) if t not in _store]
+        if missing:
+            logger.debug("Embedding cache miss; batch-encoding %d texts", len(missing))
+            _store.add(missing, _encode(missing), pinned=texts)
+        try:
+            matrix = _store.rows(texts)
+        except KeyError:  # evicted by a concurrent session between add and read
+            continue
+        break
+    assert matrix.dtype == np.float32 and matrix.flags.c_contiguous
+    return matrix
+
+
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    try:
+        import torch
+    except ImportError:
+        return False
+    if not torch.cuda.is_available():
+        logger.warning("similarity_device=cuda but no GPU is available; using NumPy")
+        return False
+    return True
+
+
+def similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """All-pairs dot products ``a @ b.T`` as float32 (cosines for unit rows)."""
+    if settings.similarity_device == "cuda" and _cuda_available():
+        import torch
+        with torch.no_grad():
+            ta = torch.from_numpy(np.ascontiguousarray(a)).to("cuda")
+            tb = ta if b is a else torch.from_numpy(np.ascontiguousarray(b)).to("cuda")
+            return (ta @ tb.T).cpu().numpy()
+    return a @ b.T
+
+
+def normalized_cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine of two unit vectors, e.g. anything from get_embedding()."""
+    return float(a @ b)
 
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-    dot = np.dot(a, b)
-    norm = np.linalg.norm(a) * np.linalg.norm(b)
-    if norm == 0:
+    # vdot goes straight to BLAS; one sqrt of the product instead of two norms.
+    norm_sq = np.vdot(a, a) * np.vdot(b, b)
+    if norm_sq == 0:
         return 0.0
-    return float(dot / norm)
+    return float(np.dot(a, b) / np.sqrt(norm_sq))
 
 
 def reset() -> None:
-    _cache.clear()
+    _store.reset()
+    disk = disk_cache("embeddings")
+    if disk is not None:
+        disk.clear()
@@ -14,14 +14,21 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
 from anthropic import Anthropic
 
 from src.matching import embeddings
 from src.matching.config import settings
-from src.matching.domain_model import best_transaction_type
+from src.matching.domain_model import (
+    TX_NAMES,
+    chain_score_matrix,
+    clear_caches,
+    transaction_matrix,
+)
 from src.matching.explanation.generator import generate_explanation
 from src.matching.extraction.intent_extractor import extract_all
 from src.matching.models import (
@@ -32,8 +39,9 @@ from src.matching.models import (
     MatchResult,
     ScoredPair,
 )
+from src.matching.profile_arrays import ProfileArrays
 from src.matching.scoring import complementarity, non_obvious, transaction_readiness
-from src.matching.scoring.composite import composite_score
+from src.matching.scoring.composite import composite_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -58,21 +66,65 @@ def load_profiles_from_json(data: list[dict]) -> list[AttendeeProfile]:
     return [AttendeeProfile(**p) for p in data]
 
 
-def _collect_embedding_corpus(profiles: list[AttendeeProfile]) -> list[str]:
-    texts = []
-    for p in profiles:
-        texts.append(complementarity._needs_provides_text(p, "needs"))
-        texts.append(complementarity._needs_provides_text(p, "provides"))
-        texts.append(non_obvious.problem_domain_text(p))
-    return texts
+def _top_k_indices(row: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the *k* largest entries, best first, ties by index.
 
+    Quickselect finds the k-th largest value in O(N); only the candidates
+    at or above it are sorted.  Same result as a stable full argsort.
+    """
+    if k >= row.size:
+        return np.argsort(-row, kind="stable")
+    kth = np.partition(row, row.size - k)[row.size - k]
+    candidates = np.flatnonzero(row >= kth)
+    return candidates[np.argsort(-row[candidates], kind="stable")][:k]
 
-def _get_roles(p: AttendeeProfile) -> list[str]:
-    if p.roles_at_event:
-        return list(p.roles_at_event)
-    if p.role_at_event:
-        return [p.role_at_event]
-    return ["other"]
+
+def _extract_parallel(
+    client: Anthropic,
+    profiles: list[AttendeeProfile],
+    progress: Callable[[str, float], None],
+) -> list[AttendeeProfile]:
+    """Extract every profile concurrently, preserving input order.
+
+    Each extraction is an independent HTTP round-trip, so a thread pool
+    hides the network latency.  Progress is reported from this thread only
+    (Streamlit widgets cannot be touched from workers); rate-limit (429)
+    retries with backoff are handled by the SDK client.
+    """
+    n = len(profiles)
+    enriched: list[AttendeeProfile | None] = [None] * n
+    workers = max(1, min(settings.extraction_concurrency, n))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(extract_all, client, profile): i
+            for i, profile in enumerate(profiles)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            enriched[futures[future]] = future.result()
+            progress("Extracting profile intelligence...", done / n * 0.25)
+    return enriched
+
+
+def _explain_parallel(
+    client: Anthropic,
+    jobs: list[tuple[ScoredPair, AttendeeProfile, AttendeeProfile]],
+    progress: Callable[[str, float], None],
+) -> dict[tuple[str, str], tuple[str, DimensionExplanations]]:
+    """Generate explanations concurrently, keyed by ``(a_id, b_id)``."""
+    if not jobs:
+        progress("Ranking...", 0.95)
+        return {}
+    results: dict[tuple[str, str], tuple[str, DimensionExplanations]] = {}
+    workers = max(1, min(settings.explanation_concurrency, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(generate_explanation, client, sp, a, b): (a.id, sp.attendee_b_id)
+            for sp, a, b in jobs
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            progress("Generating explanations...", 0.7 + done / len(jobs) * 0.3)
+    return results
 
 
 def run(
@@ -81,12 +133,22 @@ def run(
     top_k: int | None = None,
     skip_explanations: bool = False,
     progress_callback: Callable[[str, float], None] | None = None,
+    explain_top: int | None = None,
 ) -> list[MatchBriefing]:
+    """Run the full pipeline and return one briefing per attendee.
+
+    ``explain_top`` limits LLM explanations to each attendee's N best
+    matches (``None`` explains all Top-K); the rest carry scores only.
+    """
     if client is None:
-        client = Anthropic(api_key=settings.anthropic_api_key)
+        client = Anthropic(
+            api_key=settings.anthropic_api_key,
+            max_retries=settings.anthropic_max_retries,
+        )
 
     k = top_k or settings.top_k
     n = len(profiles)
+    clear_caches()
 
     def _progress(label: str, frac: float) -> None:
         if progress_callback:
@@ -94,102 +156,92 @@ def run(
 
     # Step 1: Consolidated extraction
     _progress("Extracting profile intelligence...", 0.0)
-    enriched: list[AttendeeProfile] = []
-    for i, profile in enumerate(profiles):
-        enriched.append(extract_all(client, profile))
-        _progress("Extracting profile intelligence...", (i + 1) / n * 0.25)
+    enriched = _extract_parallel(client, profiles, _progress)
 
     # Step 2: Pre-encode embeddings
     _progress("Building embedding model...", 0.25)
-    corpus = _collect_embedding_corpus(enriched)
-    embeddings.fit(corpus)
+    arrays = ProfileArrays.from_profiles(enriched)
+    embeddings.fit(arrays.needs_texts + arrays.provides_texts + arrays.domain_texts)
     _progress("Building embedding model...", 0.30)
 
-    # Step 3: Score all pairs
+    # Step 3: Score all pairs as (N, N) matrices
     _progress("Scoring pairs...", 0.30)
     profile_map = {p.id: p for p in enriched}
-    pair_scores: dict[tuple[str, str], ScoredPair] = {}
-
-    scoreable_pairs = []
-    for a in enriched:
-        for b in enriched:
-            if a.id == b.id:
-                continue
-            tx_type = best_transaction_type(_get_roles(a), _get_roles(b))
-            scoreable_pairs.append((a, b, tx_type))
-
-    total_pairs = len(scoreable_pairs)
-    for idx, (a, b, tx_type) in enumerate(scoreable_pairs):
-        comp = complementarity.score(a, b)
-        no_score = non_obvious.score(a, b)
-
-        if tx_type is None:
-            tr_score = 0.0
-        else:
-            tr_score, _ = transaction_readiness.score(a, b)
-
-        dim_scores = DimensionScores(
-            complementarity=comp,
-            transaction_readiness=tr_score,
-            non_obvious=no_score,
-        )
-        comp_score = composite_score(dim_scores)
-
-        pair_scores[(a.id, b.id)] = ScoredPair(
-            attendee_a_id=a.id,
-            attendee_b_id=b.id,
-            scores=dim_scores,
-            composite=comp_score,
-            transaction_type=tx_type,
-        )
-        _progress("Scoring pairs...", 0.30 + ((idx + 1) / total_pairs) * 0.4)
+    same_id = arrays.same_id()
 
-    # Step 4: Rank and generate explanations
-    _progress("Ranking matches...", 0.7)
-    briefings: list[MatchBriefing] = []
-    attendee_count = 0
+    tx_matrix = transaction_matrix(arrays.roles)
+    tx_matrix[same_id] = 0
 
-    for attendee in enriched:
-        candidates = [
-            sp for (a_id, _), sp in pair_scores.items()
-            if a_id == attendee.id
+    chain_matrix = chain_score_matrix(arrays.positions)
+
+    comp_matrix = complementarity.score_matrix(
+        enriched, arrays.needs_texts, arrays.provides_texts, chain_matrix,
+    )
+    tr_matrix = transaction_readiness.score_matrix(enriched, tx_matrix, arrays)
+    no_matrix = non_obvious.score_matrix(
+        enriched, arrays.domain_texts, arrays.positions, arrays.sector_id,
+    )
+    composite = composite_matrix(comp_matrix, tr_matrix, no_matrix)
+    composite[same_id] = -np.inf
+    total_pairs = int((~same_id).sum())
+
+    # Step 4: Rank
+    _progress("Ranking matches...", 0.7)
+    ranked: list[tuple[AttendeeProfile, list[ScoredPair]]] = []
+    for i, attendee in enumerate(enriched):
+        order = _top_k_indices(composite[i], k)
+        top = [
+            ScoredPair(
+                attendee_a_id=attendee.id,
+                attendee_b_id=enriched[j].id,
+                scores=DimensionScores(
+                    complementarity=float(comp_matrix[i, j]),
+                    transaction_readiness=float(tr_matrix[i, j]),
+                    non_obvious=float(no_matrix[i, j]),
+                ),
+                composite=float(composite[i, j]),
+                transaction_type=TX_NAMES[tx_matrix[i, j]],
+            )
+            for j in order
+            if not same_id[i, j]
         ]
-        candidates.sort(key=lambda sp: sp.composite, reverse=True)
-        top = candidates[:k]
+        ranked.append((attendee, top))
+
+    # Step 5: Generate explanations
+    jobs = []
+    if not skip_explanations:
+        jobs = [
+            (sp, attendee, profile_map[sp.attendee_b_id])
+            for attendee, top in ranked
+            for rank, sp in enumerate(top)
+            if explain_top is None or rank < explain_top
+        ]
+    explained = _explain_parallel(client, jobs, _progress)
 
+    briefings: list[MatchBriefing] = []
+    for attendee, top in ranked:
         matches: list[MatchResult] = []
         for sp in top:
-            if skip_explanations:
-                explanation = "(explanations skipped)"
-                dim_explanations = DimensionExplanations()
-            else:
-                other = profile_map[sp.attendee_b_id]
-                explanation, dim_explanations = generate_explanation(
-                    client, sp, attendee, other,
-                )
+            explanation, dim_explanations = explained.get(
+                (attendee.id, sp.attendee_b_id),
+                ("(explanations skipped)", DimensionExplanations()),
+            )
             matches.append(MatchResult(
                 pair=sp,
                 explanation=explanation,
                 dimension_explanations=dim_explanations,
             ))
-
         briefings.append(MatchBriefing(
             attendee_id=attendee.id,
             attendee_name=attendee.name,
             matches=matches,
         ))
-        attendee_count += 1
-        frac = 0.7 + (attendee_count / n) * 0.3 if not skip_explanations else 0.95
-        _progress(
-            "Generating explanations..." if not skip_explanations else "Ranking...",
-            frac,
-        )
 
     _progress("Complete", 1.0)
     logger.info(
         "Pipeline complete: %d profiles, %d pairs scored, %d briefings "
         "(explanations=%s)",
-        n, len(pair_scores), len(briefings),
+        n, total_pairs, len(briefings),
         "off" if skip_explanations else "on",
     )
     return briefings
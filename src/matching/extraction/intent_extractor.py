@@ -9,10 +9,11 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-from typing import Any
 
 from anthropic import Anthropic
 
+from src.matching.cache import LRUCache, disk_cache
+from src.matching.config import settings
 from src.matching.domain_model import (
     VALUE_CHAINS,
     infer_audience,
@@ -29,7 +30,9 @@ from src.matching.models import (
 
 logger = logging.getLogger(__name__)
 
-_cache: dict[str, dict[str, Any]] = {}
+# Values are the raw extraction serialized as JSON, so a cached entry can't
+# be mutated by callers and can be persisted as-is.
+_cache: LRUCache[str, str] = LRUCache(settings.extraction_cache_maxsize)
 
 _SYSTEM_PROMPT = """\
 You are an expert analyst for a Web3/blockchain conference matchmaking engine.
@@ -70,9 +73,16 @@ RULES:
 """
 
 
+# Folded into persistent cache keys so editing the prompt or switching
+# models never serves stale extractions.
+_PROMPT_VERSION = hashlib.blake2b(_SYSTEM_PROMPT.encode(), digest_size=4).hexdigest()
+
+
 def _profile_hash(profile: AttendeeProfile) -> str:
-    key = f"{profile.name}|{profile.title}|{profile.company}|{profile.product}|{profile.stated_goal}"
-    return hashlib.sha256(key.encode()).hexdigest()[:16]
+    # Keyed on the rendered prompt, so any field the LLM sees (description,
+    # sector, key facts, ...) invalidates the cached extraction.
+    message = _build_user_message(profile)
+    return hashlib.blake2b(message.encode(), digest_size=8).hexdigest()
 
 
 def _build_user_message(profile: AttendeeProfile) -> str:
@@ -146,9 +156,15 @@ _VALID_POSITIONS: dict[str, set[str]] = {
 def extract_all(client: Anthropic, profile: AttendeeProfile) -> AttendeeProfile:
     """Run consolidated extraction, returning an enriched copy of the profile."""
     h = _profile_hash(profile)
-    if h in _cache:
-        cached = _cache[h]
-        return _apply_extraction(profile, cached)
+    cached = _cache.get(h)
+    disk = disk_cache("extraction")
+    disk_key = f"{h}:{_PROMPT_VERSION}:{settings.anthropic_fast_model}"
+    if cached is None and disk is not None:
+        cached = disk.get(disk_key)
+        if cached is not None:
+            _cache.put(h, cached)
+    if cached is not None:
+        return _apply_extraction(profile, json.loads(cached))
 
     user_msg = _build_user_message(profile)
     result = call_llm_json(client, _SYSTEM_PROMPT, user_msg, fast=True)
@@ -157,7 +173,10 @@ def extract_all(client: Anthropic, profile: AttendeeProfile) -> AttendeeProfile:
         logger.warning("Empty LLM response for %s — using fallbacks", profile.name)
         result = {}
 
-    _cache[h] = result
+    serialized = json.dumps(result)
+    _cache.put(h, serialized)
+    if disk is not None:
+        disk.set(disk_key, serialized)
     return _apply_extraction(profile, result)
 
 
@@ -222,3 +241,6 @@ def _apply_extraction(
 
 def clear_cache() -> None:
     _cache.clear()
+    disk = disk_cache("extraction")
+    if disk is not None:
+        disk.clear()
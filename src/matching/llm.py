@@ -16,10 +16,18 @@ _FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL)
 
 
 def _strip_fences(text: str) -> str:
+    if "```" not in text:
+        return text.strip()
     m = _FENCE_RE.search(text)
     return m.group(1).strip() if m else text.strip()
 
 
+def _system_blocks(system: str) -> list[dict]:
+    # Marks the system prompt for Anthropic prompt caching; prompts under
+    # the model's minimum cacheable length are simply sent uncached.
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
 def call_llm_json(
     client: Anthropic,
     system: str,
@@ -31,7 +39,7 @@ def call_llm_json(
     resp = client.messages.create(
         model=model,
         max_tokens=2048,
-        system=system,
+        system=_system_blocks(system),
         messages=[{"role": "user", "content": user}],
     )
     raw = resp.content[0].text
@@ -54,7 +62,7 @@ def call_llm_text(
     resp = client.messages.create(
         model=model,
         max_tokens=1024,
-        system=system,
+        system=_system_blocks(system),
         messages=[{"role": "user", "content": user}],
     )
     return resp.content[0].text.strip()
@@ -95,6 +95,8 @@ class AttendeeProfile(BaseModel):
             self.company_description = self.product
         if self.roles_at_event is None and self.role_at_event is not None:
             self.roles_at_event = [self.role_at_event]
+        if not self.sector:
+            self.sector = None
         return self
 
 
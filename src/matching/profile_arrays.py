@@ -0,0 +1,114 @@
+"""Column-oriented projection of enriched profiles for all-pairs scoring.
+
+Scoring touches the same handful of fields for every pair.  Reading them
+off the pydantic models once per profile, into parallel arrays indexed by
+row, keeps attribute access O(N) instead of O(N^2).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from src.matching.domain_model import (
+    infer_mandate_score,
+    infer_maturity_score,
+    sector_ids,
+    stage_index,
+)
+from src.matching.models import AttendeeProfile
+from src.matching.scoring import complementarity, non_obvious
+
+_URGENCY_BONUS: dict[str, float] = {"active": 0.1, "exploring": 0.05}
+
+
+# Also used per pair by transaction_readiness' pairwise scorer, which would
+# otherwise rebuild them for every pair; keyed on content so they stay valid
+# across runs.
+@lru_cache(maxsize=4096)
+def word_set(text: str) -> frozenset[str]:
+    return frozenset(text.lower().split())
+
+
+@lru_cache(maxsize=4096)
+def region_set(regions: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(regions)
+
+
+def profile_roles(p: AttendeeProfile) -> list[str]:
+    if p.roles_at_event:
+        return list(p.roles_at_event)
+    if p.role_at_event:
+        return [p.role_at_event]
+    return ["other"]
+
+
+@dataclass(frozen=True)
+class ProfileArrays:
+    ids: np.ndarray                         # (N,) object
+    roles: list[list[str]]
+    positions: list[list[tuple[str, str]]]
+    needs_texts: list[str]
+    provides_texts: list[str]
+    domain_texts: list[str]
+
+    # Transaction-readiness inputs
+    authority: np.ndarray                   # (N,) float32, title seniority
+    urgency_bonus: np.ndarray               # (N,) float32
+    maturity: np.ndarray                    # (N,) float32
+    sector_id: np.ndarray                   # (N,) int32, -1 when unknown
+    stage_id: np.ndarray                    # (N,) intp, see stage_index()
+    need_words: list[frozenset[str] | None]  # None without a needs vector
+    cap_words: list[frozenset[str] | None]   # None without a provides vector
+    geo_sets: list[frozenset[str] | None]    # None without a provides vector
+
+    @classmethod
+    def from_profiles(cls, profiles: list[AttendeeProfile]) -> ProfileArrays:
+        return cls(
+            ids=np.array([p.id for p in profiles], dtype=object),
+            roles=[profile_roles(p) for p in profiles],
+            positions=[p.value_chain_positions or [] for p in profiles],
+            needs_texts=[complementarity.needs_provides_text(p, "needs") for p in profiles],
+            provides_texts=[
+                complementarity.needs_provides_text(p, "provides") for p in profiles
+            ],
+            domain_texts=[non_obvious.problem_domain_text(p) for p in profiles],
+            authority=np.array(
+                [infer_mandate_score(p.title) for p in profiles], dtype=np.float32,
+            ),
+            urgency_bonus=np.array(
+                [
+                    _URGENCY_BONUS.get(p.needs_vector.urgency, 0.0) if p.needs_vector else 0.0
+                    for p in profiles
+                ],
+                dtype=np.float32,
+            ),
+            maturity=np.array(
+                [infer_maturity_score(p.key_facts, p.stage) for p in profiles],
+                dtype=np.float32,
+            ),
+            sector_id=sector_ids([p.sector for p in profiles]),
+            stage_id=np.array([stage_index(p.stage) for p in profiles], dtype=np.intp),
+            need_words=[
+                word_set(p.needs_vector.target_counterparty_type) if p.needs_vector else None
+                for p in profiles
+            ],
+            cap_words=[
+                word_set(p.provides_vector.primary_capability) if p.provides_vector else None
+                for p in profiles
+            ],
+            geo_sets=[
+                region_set(tuple(p.provides_vector.geographic_reach))
+                if p.provides_vector else None
+                for p in profiles
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def same_id(self) -> np.ndarray:
+        """(N, N) bool mask of pairs that refer to the same attendee."""
+        return self.ids[:, None] == self.ids[None, :]
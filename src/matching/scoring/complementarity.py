@@ -10,15 +10,22 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
+
 from src.matching.config import settings
-from src.matching.domain_model import best_chain_score
-from src.matching.embeddings import cosine_similarity, get_embedding
+from src.matching.domain_model import best_chain_score, chain_score_matrix
+from src.matching.embeddings import (
+    get_embedding,
+    get_matrix,
+    normalized_cosine,
+    similarity_matrix,
+)
 from src.matching.models import AttendeeProfile
 
 logger = logging.getLogger(__name__)
 
 
-def _needs_provides_text(profile: AttendeeProfile, vector_type: str) -> str:
+def needs_provides_text(profile: AttendeeProfile, vector_type: str) -> str:
     if vector_type == "needs" and profile.needs_vector:
         nv = profile.needs_vector
         return (
@@ -40,18 +47,18 @@ def score(a: AttendeeProfile, b: AttendeeProfile) -> float:
     """Compute complementarity score for A's perspective on B.  [0.0, 1.0]."""
     weights = settings.complementarity_weights
 
-    a_needs_text = _needs_provides_text(a, "needs")
-    b_provides_text = _needs_provides_text(b, "provides")
-    a_provides_text = _needs_provides_text(a, "provides")
-    b_needs_text = _needs_provides_text(b, "needs")
+    a_needs_text = needs_provides_text(a, "needs")
+    b_provides_text = needs_provides_text(b, "provides")
+    a_provides_text = needs_provides_text(a, "provides")
+    b_needs_text = needs_provides_text(b, "needs")
 
     a_needs_emb = get_embedding(a_needs_text)
     b_provides_emb = get_embedding(b_provides_text)
     a_provides_emb = get_embedding(a_provides_text)
     b_needs_emb = get_embedding(b_needs_text)
 
-    ab_alignment = cosine_similarity(a_needs_emb, b_provides_emb)
-    ba_alignment = cosine_similarity(b_needs_emb, a_provides_emb)
+    ab_alignment = normalized_cosine(a_needs_emb, b_provides_emb)
+    ba_alignment = normalized_cosine(b_needs_emb, a_provides_emb)
     avg_alignment = (ab_alignment + ba_alignment) / 2.0
 
     positions_a = a.value_chain_positions or []
@@ -74,8 +81,62 @@ def score(a: AttendeeProfile, b: AttendeeProfile) -> float:
     )
 
     result = min(max(composite, 0.0), 1.0)
-    logger.debug(
-        "Complementarity %s->%s: align=%.3f chain=%.3f bidir=%.3f -> %.3f",
-        a.name, b.name, avg_alignment, chain_score, bidir_raw, result,
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Complementarity %s->%s: align=%.3f chain=%.3f bidir=%.3f -> %.3f",
+            a.name, b.name, avg_alignment, chain_score, bidir_raw, result,
+        )
     return result
+
+
+def score_matrix(
+    profiles: list[AttendeeProfile],
+    needs_texts: list[str] | None = None,
+    provides_texts: list[str] | None = None,
+    chain_score: np.ndarray | None = None,
+) -> np.ndarray:
+    """Complementarity for every ordered pair.  Entry [i, j] is i's view of j.
+
+    Embeddings are unit-normalized, so one NEEDS x PROVIDES matmul yields
+    every directional alignment: align[i, j] is i's needs against j's
+    provides, and align.T holds the reverse direction.  Callers that have
+    already built the per-profile texts or chain matrix can pass them in.
+    """
+    if needs_texts is None:
+        needs_texts = [needs_provides_text(p, "needs") for p in profiles]
+    if provides_texts is None:
+        provides_texts = [needs_provides_text(p, "provides") for p in profiles]
+    needs = get_matrix(needs_texts)
+    provides = get_matrix(provides_texts)
+    alignment = similarity_matrix(needs, provides)
+
+    if chain_score is None:
+        chain_score = chain_score_matrix(
+            [p.value_chain_positions or [] for p in profiles],
+        )
+    return _combine(alignment, chain_score)
+
+
+def _combine(alignment: np.ndarray, chain_score: np.ndarray) -> np.ndarray:
+    """Blend directional alignment and chain adjacency, in place where possible.
+
+    ``alignment[i, j]`` is i's needs against j's provides, so the reverse
+    direction is just the transpose and never needs its own matmul.
+    """
+    weights = settings.complementarity_weights
+    threshold = settings.bidirectional_threshold
+
+    avg_alignment = alignment + alignment.T
+    avg_alignment *= 0.5
+
+    above = alignment > threshold
+    above &= above.T
+    bidir_raw = np.multiply(avg_alignment, settings.bidirectional_boost)
+    np.minimum(bidir_raw, 1.0, out=bidir_raw)
+    np.copyto(bidir_raw, avg_alignment, where=~above)
+
+    out = np.multiply(avg_alignment, weights.needs_provides_alignment)
+    out += weights.value_chain_adjacency * chain_score
+    bidir_raw *= weights.bidirectional_multiplier
+    out += bidir_raw
+    return np.clip(out, 0.0, 1.0, out=out)
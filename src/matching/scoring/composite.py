@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from src.matching.config import settings
 from src.matching.models import DimensionScores
 
@@ -13,3 +15,16 @@ def composite_score(scores: DimensionScores) -> float:
         + w.transaction_readiness * scores.transaction_readiness
         + w.non_obvious * scores.non_obvious
     )
+
+
+def composite_matrix(
+    complementarity: np.ndarray,
+    transaction_readiness: np.ndarray,
+    non_obvious: np.ndarray,
+) -> np.ndarray:
+    """Vectorized composite_score over (N, N) dimension-score matrices."""
+    w = settings.dimension_weights
+    out = np.multiply(complementarity, w.complementarity)
+    out += w.transaction_readiness * transaction_readiness
+    out += w.non_obvious * non_obvious
+    return out
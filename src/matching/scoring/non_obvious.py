@@ -7,9 +7,21 @@ Secondary signal (20%): semantic embedding similarity.
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 
-from src.matching.domain_model import non_obvious_tag_score
-from src.matching.embeddings import cosine_similarity, get_embedding
+import numpy as np
+
+from src.matching.domain_model import (
+    non_obvious_tag_score,
+    sector_ids,
+    tag_score_matrix,
+)
+from src.matching.embeddings import (
+    get_embedding,
+    get_matrix,
+    normalized_cosine,
+    similarity_matrix,
+)
 from src.matching.models import AttendeeProfile
 
 logger = logging.getLogger(__name__)
@@ -20,15 +32,34 @@ EMBED_WEIGHT = 0.20
 
 def problem_domain_text(profile: AttendeeProfile) -> str:
     """Construct the problem-domain statement for embedding."""
+    return _problem_domain_text(
+        profile.company_description,
+        profile.needs_vector.primary_need if profile.needs_vector else None,
+        profile.provides_vector.primary_capability if profile.provides_vector else None,
+        profile.title,
+        profile.company,
+        profile.stated_goal,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _problem_domain_text(
+    company_description: str | None,
+    primary_need: str | None,
+    primary_capability: str | None,
+    title: str,
+    company: str,
+    stated_goal: str | None,
+) -> str:
     parts = []
-    if profile.company_description:
-        parts.append(profile.company_description)
-    if profile.needs_vector:
-        parts.append(f"Key challenges: {profile.needs_vector.primary_need}.")
-    if profile.provides_vector:
-        parts.append(f"Building toward: {profile.provides_vector.primary_capability}.")
+    if company_description:
+        parts.append(company_description)
+    if primary_need is not None:
+        parts.append(f"Key challenges: {primary_need}.")
+    if primary_capability is not None:
+        parts.append(f"Building toward: {primary_capability}.")
     if not parts:
-        parts.append(f"{profile.title} at {profile.company}. {profile.stated_goal}")
+        parts.append(f"{title} at {company}. {stated_goal}")
     return " ".join(parts)
 
 
@@ -46,17 +77,49 @@ def score(a: AttendeeProfile, b: AttendeeProfile) -> float:
     try:
         emb_a = get_embedding(text_a)
         emb_b = get_embedding(text_b)
-        embed_sim = cosine_similarity(emb_a, emb_b)
+        embed_sim = normalized_cosine(emb_a, emb_b)
     except RuntimeError:
         embed_sim = 0.0
 
     combined = TAG_WEIGHT * tag_score + EMBED_WEIGHT * embed_sim
     result = min(max(combined, 0.0), 1.0)
 
-    logger.debug(
-        "Non-obvious %s<->%s: tags=%.3f (shared=%s) embed=%.3f -> %.3f",
-        a.name, b.name, tag_score,
-        ",".join(sorted(shared_tags)) if shared_tags else "none",
-        embed_sim, result,
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Non-obvious %s<->%s: tags=%.3f (shared=%s) embed=%.3f -> %.3f",
+            a.name, b.name, tag_score,
+            ",".join(sorted(shared_tags)) if shared_tags else "none",
+            embed_sim, result,
+        )
     return result
+
+
+def score_matrix(
+    profiles: list[AttendeeProfile],
+    domain_texts: list[str] | None = None,
+    positions: list[list[tuple[str, str]]] | None = None,
+    sector_id: np.ndarray | None = None,
+) -> np.ndarray:
+    """Non-obvious connection score for every pair.  Symmetric, [0.0, 1.0].
+
+    The per-profile columns can be passed in precomputed (see
+    ProfileArrays); otherwise they are read off *profiles* once.
+    """
+    if domain_texts is None:
+        domain_texts = [problem_domain_text(p) for p in profiles]
+    if positions is None:
+        positions = [p.value_chain_positions or [] for p in profiles]
+    if sector_id is None:
+        sector_id = sector_ids([p.sector for p in profiles])
+    tag_scores = tag_score_matrix(positions, sector_id)
+
+    try:
+        emb = get_matrix(domain_texts)
+        embed_sim = similarity_matrix(emb, emb)
+    except RuntimeError:
+        embed_sim = np.zeros_like(tag_scores)
+
+    embed_sim *= EMBED_WEIGHT
+    tag_scores *= TAG_WEIGHT
+    tag_scores += embed_sim
+    return np.clip(tag_scores, 0.0, 1.0, out=tag_scores)
@@ -10,36 +10,22 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
+
 from src.matching.config import settings
-from src.matching.embeddings import cosine_similarity, get_embedding
+from src.matching.domain_model import sector_ids
+from src.matching.embeddings import (
+    get_embedding,
+    get_matrix,
+    normalized_cosine,
+    similarity_matrix,
+)
 from src.matching.models import AttendeeProfile
+from src.matching.scoring.non_obvious import problem_domain_text
 
 logger = logging.getLogger(__name__)
 
 
-def problem_domain_text(profile: AttendeeProfile) -> str:
-    """Construct the problem-domain statement for embedding."""
-    parts = []
-
-    if profile.company_description:
-        parts.append(profile.company_description)
-
-    if profile.needs_vector:
-        parts.append(f"Key challenges: {profile.needs_vector.primary_need}.")
-
-    if profile.provides_vector:
-        parts.append(
-            f"Building toward: {profile.provides_vector.primary_capability}."
-        )
-
-    if not parts:
-        parts.append(
-            f"{profile.title} at {profile.company}. {profile.stated_goal}"
-        )
-
-    return " ".join(parts)
-
-
 def score(
     a: AttendeeProfile,
     b: AttendeeProfile,
@@ -54,7 +40,7 @@ def score(
     emb_a = get_embedding(text_a)
     emb_b = get_embedding(text_b)
 
-    similarity = cosine_similarity(emb_a, emb_b)
+    similarity = normalized_cosine(emb_a, emb_b)
 
     # Novelty boost: different sectors + high similarity → cross-boundary insight
     different_sectors = (
@@ -76,3 +62,33 @@ def score(
         a.name, b.name, similarity, a.sector, b.sector,
     )
     return max(min(similarity, 1.0), 0.0)
+
+
+def score_matrix(
+    profiles: list[AttendeeProfile],
+    domain_texts: list[str] | None = None,
+    sector_id: np.ndarray | None = None,
+) -> np.ndarray:
+    """Non-obvious connection score for every pair.  Symmetric, [0.0, 1.0].
+
+    Stored embeddings are unit-normalized, so one matmul gives every
+    cosine; the cross-sector novelty boost is applied as a single mask.
+    """
+    if domain_texts is None:
+        domain_texts = [problem_domain_text(p) for p in profiles]
+    emb = get_matrix(domain_texts)
+    similarity = similarity_matrix(emb, emb)
+
+    if sector_id is None:
+        sector_id = sector_ids([p.sector for p in profiles])
+    known = sector_id >= 0
+    boost = sector_id[:, None] != sector_id[None, :]
+    boost &= known[:, None]
+    boost &= known[None, :]
+    boost &= similarity > settings.novelty_similarity_threshold
+
+    boosted = np.multiply(similarity, settings.novelty_boost)
+    np.minimum(boosted, 1.0, out=boosted)
+    np.clip(similarity, 0.0, 1.0, out=similarity)
+    np.copyto(similarity, boosted, where=boost)
+    return similarity
@@ -8,37 +8,53 @@ from __future__ import annotations
 
 import logging
 
+import numpy as np
+
 from src.matching.domain_model import (
+    STAGE_CUBE,
+    TX_NAMES,
     best_transaction_type,
     infer_mandate_score,
     infer_maturity_score,
     stage_compatibility,
 )
 from src.matching.models import AttendeeProfile
+from src.matching.profile_arrays import ProfileArrays, region_set, word_set
 
 logger = logging.getLogger(__name__)
 
-_WEIGHTS: dict[str, dict[str, float]] = {
-    "investment":               {"mandate": 0.30, "fit": 0.30, "maturity": 0.25, "alignment": 0.15},
-    "fundraising":              {"mandate": 0.30, "fit": 0.30, "maturity": 0.25, "alignment": 0.15},
-    "co_investment":            {"mandate": 0.30, "fit": 0.30, "maturity": 0.25, "alignment": 0.15},
-    "partnership":              {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "gtm_partnership":          {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "tech_partnership":         {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "integration":              {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "technical_collaboration":  {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "policy_dialogue":          {"mandate": 0.30, "fit": 0.20, "maturity": 0.25, "alignment": 0.25},
-    "sandbox_candidacy":        {"mandate": 0.30, "fit": 0.20, "maturity": 0.25, "alignment": 0.25},
-    "sandbox_candidates":       {"mandate": 0.30, "fit": 0.20, "maturity": 0.25, "alignment": 0.25},
-    "sandbox_evaluation":       {"mandate": 0.30, "fit": 0.20, "maturity": 0.25, "alignment": 0.25},
-    "sandbox_participation":    {"mandate": 0.30, "fit": 0.20, "maturity": 0.25, "alignment": 0.25},
-    "policy_coordination":      {"mandate": 0.30, "fit": 0.20, "maturity": 0.25, "alignment": 0.25},
-    "media_exposure":           {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "content_collaboration":    {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
-    "investment_pitch":         {"mandate": 0.30, "fit": 0.30, "maturity": 0.25, "alignment": 0.15},
-    "tech_evaluation":          {"mandate": 0.20, "fit": 0.25, "maturity": 0.30, "alignment": 0.25},
+# (mandate, fit, maturity, alignment) weights per transaction type.
+_CAPITAL = (0.30, 0.30, 0.25, 0.15)
+_COMMERCIAL = (0.20, 0.25, 0.30, 0.25)
+_POLICY = (0.30, 0.20, 0.25, 0.25)
+
+_WEIGHTS: dict[str, tuple[float, float, float, float]] = {
+    "investment":               _CAPITAL,
+    "fundraising":              _CAPITAL,
+    "co_investment":            _CAPITAL,
+    "partnership":              _COMMERCIAL,
+    "gtm_partnership":          _COMMERCIAL,
+    "tech_partnership":         _COMMERCIAL,
+    "integration":              _COMMERCIAL,
+    "technical_collaboration":  _COMMERCIAL,
+    "policy_dialogue":          _POLICY,
+    "sandbox_candidacy":        _POLICY,
+    "sandbox_candidates":       _POLICY,
+    "sandbox_evaluation":       _POLICY,
+    "sandbox_participation":    _POLICY,
+    "policy_coordination":      _POLICY,
+    "media_exposure":           _COMMERCIAL,
+    "content_collaboration":    _COMMERCIAL,
+    "investment_pitch":         _CAPITAL,
+    "tech_evaluation":          _COMMERCIAL,
 }
-_DEFAULT_WEIGHTS = {"mandate": 0.25, "fit": 0.25, "maturity": 0.25, "alignment": 0.25}
+_DEFAULT_WEIGHTS = (0.25, 0.25, 0.25, 0.25)
+
+# The same weights indexed by TX_NAMES code, for the matrix path.
+_WEIGHT_ROWS = np.array(
+    [_WEIGHTS.get(tx, _DEFAULT_WEIGHTS) if tx else _DEFAULT_WEIGHTS for tx in TX_NAMES],
+    dtype=np.float32,
+)
 
 
 def _score_mandate(a: AttendeeProfile, b: AttendeeProfile) -> float:
@@ -55,10 +71,8 @@ def _score_mandate(a: AttendeeProfile, b: AttendeeProfile) -> float:
 def _score_fit(a: AttendeeProfile, b: AttendeeProfile) -> float:
     fit = 0.5
     if a.needs_vector and b.provides_vector:
-        a_target = a.needs_vector.target_counterparty_type.lower()
-        b_cap = b.provides_vector.primary_capability.lower()
-        a_words = set(a_target.split())
-        b_words = set(b_cap.split())
+        a_words = word_set(a.needs_vector.target_counterparty_type)
+        b_words = word_set(b.provides_vector.primary_capability)
         overlap = len(a_words & b_words)
         if overlap >= 2:
             fit += 0.3
@@ -76,8 +90,8 @@ def _score_alignment(a: AttendeeProfile, b: AttendeeProfile) -> float:
     if a.sector and b.sector and a.sector == b.sector:
         alignment += 0.2
     if a.provides_vector and b.provides_vector:
-        a_geo = set(a.provides_vector.geographic_reach)
-        b_geo = set(b.provides_vector.geographic_reach)
+        a_geo = region_set(tuple(a.provides_vector.geographic_reach))
+        b_geo = region_set(tuple(b.provides_vector.geographic_reach))
         geo_overlap = a_geo & b_geo
         if geo_overlap and "global" not in geo_overlap:
             alignment += 0.2
@@ -98,6 +112,101 @@ def score(
         logger.debug("No transaction type for %s->%s", a.name, b.name)
         return 0.0, None
 
+    return _score_for_type(a, b, tx_type), tx_type
+
+
+def score_matrix(
+    profiles: list[AttendeeProfile],
+    tx_matrix: np.ndarray,
+    arrays: ProfileArrays | None = None,
+) -> np.ndarray:
+    """Transaction-readiness for every ordered pair.
+
+    ``tx_matrix`` holds TX_NAMES codes per pair; pairs with code 0 (no
+    viable transaction) score 0.0.  Sub-scores are broadcast from the
+    per-profile columns in ``arrays`` (built from *profiles* if omitted);
+    word and region overlaps come from incidence-matrix products and stage
+    compatibility from one STAGE_CUBE gather, so no step loops over pairs.
+    """
+    if arrays is None:
+        arrays = ProfileArrays.from_profiles(profiles)
+
+    authority = arrays.authority
+    mandate = (authority[:, None] + authority[None, :]) * 0.5
+    mandate += arrays.urgency_bonus[:, None]
+    np.minimum(mandate, 1.0, out=mandate)
+
+    known = arrays.sector_id >= 0
+    both_known = known[:, None] & known[None, :]
+    same_sector = both_known & (arrays.sector_id[:, None] == arrays.sector_id[None, :])
+
+    # Set intersections as incidence-matrix products: overlap[i, j] is
+    # |need_words[i] & cap_words[j]|, shared_geo[i, j] likewise for regions.
+    need_inc, cap_inc = _incidence(arrays.need_words, arrays.cap_words)
+    overlap = need_inc @ cap_inc.T
+    has_words = _present(arrays.need_words)[:, None] & _present(arrays.cap_words)[None, :]
+    word_bonus = np.where(overlap >= 2, 0.3, np.where(overlap >= 1, 0.15, 0.0))
+    word_bonus[~has_words] = 0.0
+
+    (geo_inc,) = _incidence(arrays.geo_sets)
+    shared_geo = geo_inc @ geo_inc.T
+    is_global = np.array(
+        [bool(g) and "global" in g for g in arrays.geo_sets], dtype=bool,
+    )
+    has_geo = _present(arrays.geo_sets)
+    geo_bonus = np.where(
+        is_global[:, None] & is_global[None, :], 0.1, np.where(shared_geo > 0, 0.2, 0.0),
+    )
+    geo_bonus[~(has_geo[:, None] & has_geo[None, :])] = 0.0
+
+    stage_id = arrays.stage_id
+    stage_score = STAGE_CUBE[tx_matrix, stage_id[:, None], stage_id[None, :]]
+
+    fit = 0.5 + word_bonus + np.where(same_sector, 0.15, np.where(both_known, 0.05, 0.0))
+    np.minimum(fit, 1.0, out=fit)
+
+    maturity = (arrays.maturity[:, None] + arrays.maturity[None, :]) * 0.5
+
+    alignment = 0.4 + geo_bonus + np.where(same_sector, 0.2, 0.0)
+    np.minimum(alignment, 1.0, out=alignment)
+
+    weights = _WEIGHT_ROWS[tx_matrix]
+    rule_score = (
+        weights[..., 0] * mandate
+        + weights[..., 1] * fit
+        + weights[..., 2] * maturity
+        + weights[..., 3] * alignment
+    )
+    blended = 0.7 * rule_score + 0.3 * stage_score
+    np.clip(blended, 0.0, 1.0, out=blended)
+    blended[tx_matrix == 0] = 0.0
+    return blended.astype(np.float32, copy=False)
+
+
+def _present(sets: list[frozenset[str] | None]) -> np.ndarray:
+    return np.array([s is not None for s in sets], dtype=bool)
+
+
+def _incidence(*groups: list[frozenset[str] | None]) -> tuple[np.ndarray, ...]:
+    """One (N, V) 0/1 float32 matrix per group over their shared vocabulary."""
+    vocab: dict[str, int] = {}
+    for sets in groups:
+        for s in sets:
+            for token in s or ():
+                vocab.setdefault(token, len(vocab))
+    out = []
+    for sets in groups:
+        inc = np.zeros((len(sets), len(vocab)), dtype=np.float32)
+        for i, s in enumerate(sets):
+            if s:
+                inc[i, [vocab[t] for t in s]] = 1.0
+        out.append(inc)
+    return tuple(out)
+
+
+def _score_for_type(
+    a: AttendeeProfile, b: AttendeeProfile, tx_type: str,
+) -> float:
     mandate = _score_mandate(a, b)
     fit = _score_fit(a, b)
     maturity_a = infer_maturity_score(a.key_facts, a.stage)
@@ -105,22 +214,23 @@ def score(
     maturity = (maturity_a + maturity_b) / 2.0
     alignment = _score_alignment(a, b)
 
-    weights = _WEIGHTS.get(tx_type, _DEFAULT_WEIGHTS)
+    w_mandate, w_fit, w_maturity, w_alignment = _WEIGHTS.get(tx_type, _DEFAULT_WEIGHTS)
     rule_score = (
-        weights["mandate"] * mandate
-        + weights["fit"] * fit
-        + weights["maturity"] * maturity
-        + weights["alignment"] * alignment
+        w_mandate * mandate
+        + w_fit * fit
+        + w_maturity * maturity
+        + w_alignment * alignment
     )
 
     stage_score = stage_compatibility(tx_type, a.stage, b.stage)
     blended = 0.7 * rule_score + 0.3 * stage_score
-    result = min(max(blended, 0.0), 1.0)
-
-    logger.debug(
-        "Transaction-readiness %s->%s (%s): mandate=%.2f fit=%.2f "
-        "maturity=%.2f align=%.2f stage=%.2f -> %.3f",
-        a.name, b.name, tx_type, mandate, fit, maturity, alignment,
-        stage_score, result,
-    )
-    return result, tx_type
+    result = 0.0 if blended < 0.0 else min(blended, 1.0)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Transaction-readiness %s->%s (%s): mandate=%.2f fit=%.2f "
+            "maturity=%.2f align=%.2f stage=%.2f -> %.3f",
+            a.name, b.name, tx_type, mandate, fit, maturity, alignment,
+            stage_score, result,
+        )
+    return result
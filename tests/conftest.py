@@ -0,0 +1,120 @@
+"""Shared fixtures — offline stand-ins for the embedding model and Anthropic."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.matching import embeddings
+from src.matching.cache import disk_cache
+from src.matching.config import settings
+from src.matching.domain_model import VALUE_CHAINS
+from src.matching.extraction import intent_extractor
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=4).digest(), "little")
+
+
+class FakeEmbeddingModel:
+    """Deterministic stand-in for the sentence-transformer (no download)."""
+
+    dim = 16
+
+    def _vec(self, text: str) -> np.ndarray:
+        v = np.random.default_rng(_seed(text)).standard_normal(self.dim)
+        return (v / np.linalg.norm(v)).astype(np.float32)
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return self._vec(texts)
+        return np.stack([self._vec(t) for t in texts])
+
+
+class FakeAnthropic:
+    """Returns a deterministic extraction for each profile message.
+
+    Explanation requests (the full model) get ``"<perspective> -> <other>"``
+    back, and each such pair is recorded in ``explained``.
+    """
+
+    _ROLES = [
+        "deploying_capital", "raising_capital", "exploring_partnerships",
+        "seeking_technology", "regulatory_policy", "media_content",
+    ]
+
+    def __init__(self) -> None:
+        self.messages = SimpleNamespace(create=self._create)
+        self.explained: list[tuple[str, str]] = []
+
+    def _create(self, *, model, max_tokens, system, messages):
+        user = messages[0]["content"]
+        if model == settings.anthropic_model:
+            return self._explain(user)
+        rng = random.Random(_seed(user))
+        chains = list(VALUE_CHAINS)
+        positions = []
+        for _ in range(rng.randint(0, 2)):
+            chain = rng.choice(chains)
+            positions.append([chain, rng.choice(VALUE_CHAINS[chain])])
+        data = {
+            "needs": {
+                "primary_need": f"need {rng.randint(0, 3)}",
+                "target_counterparty_type": rng.choice(["fund partner", "bank", ""]),
+                "urgency": rng.choice(["active", "exploring", "passive"]),
+            },
+            "provides": {
+                "primary_capability": f"capability {rng.randint(0, 3)}",
+                "geographic_reach": rng.sample(["europe", "apac", "global"], 1),
+            },
+            "roles_at_event": rng.sample(self._ROLES, rng.randint(1, 2)),
+            "value_chain_positions": positions,
+        }
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(data))])
+
+    def _explain(self, user: str) -> SimpleNamespace:
+        a_name, b_name = [
+            line.split(":", 1)[1].strip()
+            for line in user.splitlines() if line.startswith("  Name:")
+        ]
+        self.explained.append((a_name, b_name))
+        data = {"explanation": f"{a_name} -> {b_name}", "complementarity": b_name}
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(data))])
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    """Keep the suite off the developer's CACHE_DIR; tests opt in via tmp_path."""
+    monkeypatch.setattr(settings, "cache_dir", None)
+    disk_cache.cache_clear()
+    yield
+    disk_cache.cache_clear()
+
+
+@pytest.fixture
+def disk_tier(tmp_path, monkeypatch):
+    """Enable the persistent cache tier under a throwaway directory."""
+    pytest.importorskip("diskcache")
+    monkeypatch.setattr(settings, "cache_dir", tmp_path)
+    disk_cache.cache_clear()
+    return tmp_path
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(embeddings, "_model", FakeEmbeddingModel())
+    embeddings.reset()
+    yield
+    embeddings.reset()
+
+
+@pytest.fixture
+def fake_client():
+    intent_extractor.clear_cache()
+    yield FakeAnthropic()
+    intent_extractor.clear_cache()
@@ -0,0 +1,119 @@
+"""Unit tests for the bounded in-process caches."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.matching.cache import LRUCache, disk_cache
+from src.matching.embeddings import EmbeddingStore
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "b" is now the oldest
+        cache.put("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_overwrite_does_not_evict(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 10)
+        assert len(cache) == 2
+        assert cache.get("a") == 10
+        assert cache.get("b") == 2
+
+    def test_missing_key_returns_default(self):
+        cache = LRUCache(1)
+        assert cache.get("x") is None
+        assert cache.get("x", 0) == 0
+
+    def test_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+
+class TestDiskCache:
+    def test_disabled_without_cache_dir(self):
+        assert disk_cache("extraction") is None
+
+    def test_persists_under_cache_dir(self, disk_tier):
+        disk_cache("extraction").set("k", "v")
+        disk_cache("extraction").close()
+        disk_cache.cache_clear()
+        assert disk_cache("extraction").get("k") == "v"
+        assert (disk_tier / "extraction").is_dir()
+
+
+class TestEmbeddingStore:
+    def test_rows_are_views_of_one_contiguous_matrix(self):
+        store = EmbeddingStore(maxsize=10)
+        store.add(["a", "b"], np.eye(2, 3))
+        store.add(["c"], np.ones(3))
+        assert store.matrix.shape == (3, 3)
+        assert store.matrix.flags["C_CONTIGUOUS"]
+        assert np.shares_memory(store.get("c"), store.matrix)
+        np.testing.assert_array_equal(store.rows(["c", "a"]), [[1, 1, 1], [1, 0, 0]])
+        assert store.get("missing") is None
+
+    def test_evicts_least_recently_read_when_full(self):
+        store = EmbeddingStore(maxsize=3)
+        store.add(["a", "b", "c"], np.eye(3))
+        store.rows(["a"])  # "b" is now the oldest
+        store.add(["d"], np.ones(3))
+        assert len(store) == 3
+        assert "b" not in store
+        np.testing.assert_array_equal(
+            store.rows(["a", "c", "d"]), [[1, 0, 0], [0, 0, 1], [1, 1, 1]],
+        )
+
+    def test_pinned_rows_survive_eviction(self):
+        store = EmbeddingStore(maxsize=4)
+        store.add(["a", "b", "c"], np.eye(3))
+        store.add(["x", "y"], np.ones((2, 3)), pinned=["a", "b", "x", "y"])
+        assert "c" not in store
+        assert store.rows(["a", "b", "x", "y"]).shape == (4, 3)
+
+    def test_grows_past_maxsize_when_everything_is_pinned(self):
+        store = EmbeddingStore(maxsize=2)
+        store.add(["a", "b"], np.eye(2))
+        store.add(["c"], np.ones(2), pinned=["a", "b", "c"])
+        assert len(store) == 3
+        store.add(["d"], np.ones(2))
+        assert len(store) == 2
+        assert set(store.index) == {"c", "d"}
+
+    def test_eviction_does_not_rewrite_handed_out_rows(self):
+        store = EmbeddingStore(maxsize=2)
+        store.add(["a", "b"], np.eye(2))
+        b = store.get("b")
+        store.rows(["b"])
+        store.add(["c"], np.ones(2))
+        np.testing.assert_array_equal(b, [0, 1])
+
+    def test_int8_round_trip_preserves_cosine(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(8, 384)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store = EmbeddingStore(maxsize=8, quantize=True)
+        store.add([str(i) for i in range(8)], vectors)
+        assert store.matrix.dtype == np.int8
+        restored = store.rows([str(i) for i in range(8)])
+        assert restored.dtype == np.float32
+        np.testing.assert_allclose(restored @ restored.T, vectors @ vectors.T, atol=5e-3)
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_gathered_rows_are_contiguous_float32(self, quantize):
+        store = EmbeddingStore(maxsize=4, quantize=quantize)
+        store.add(["a", "b", "c"], np.arange(12, dtype=np.float64).reshape(3, 4))
+        gathered = store.rows(["c", "a", "c"])
+        assert gathered.dtype == np.float32
+        assert gathered.flags["C_CONTIGUOUS"]
+
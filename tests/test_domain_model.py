@@ -1,17 +1,33 @@
 """Unit tests for the deterministic domain model."""
 
+import itertools
+
+import pytest
+
 from src.matching.domain_model import (
     ALL_PROBLEM_DOMAINS,
+    ALL_ROLES,
     POSITION_TAGS,
     ROLE_TRANSACTION_MATRIX,
+    STAGE_CUBE,
+    STAGE_NAMES,
+    TX_NAMES,
+    TX_TABLE,
     VALUE_CHAINS,
     best_chain_score,
     best_transaction_type,
+    chain_score_matrix,
     get_transaction_type,
+    infer_capability,
+    infer_mandate_score,
     non_obvious_tag_score,
     position_tags,
+    sector_ids,
     shared_problem_domains,
     stage_compatibility,
+    stage_index,
+    tag_score_matrix,
+    transaction_matrix,
     value_chain_adjacency_score,
 )
 
@@ -41,6 +57,20 @@ class TestValueChains:
         )
         assert s == 0.2
 
+    def test_adjacency_same_chain_two_apart(self):
+        s = value_chain_adjacency_score(
+            "tokenized_securities", "issuance",
+            "tokenized_securities", "settlement",
+        )
+        assert s == 0.6
+
+    def test_adjacency_unknown_position(self):
+        s = value_chain_adjacency_score(
+            "tokenized_securities", "issuance",
+            "tokenized_securities", "unknown",
+        )
+        assert s == 0.3
+
     def test_cross_chain_high_overlap(self):
         s = value_chain_adjacency_score(
             "tokenized_securities", "compliance_audit",
@@ -68,6 +98,19 @@ class TestBestChainScore:
         s = best_chain_score([], [("tokenized_securities", "issuance")])
         assert s == 0.3
 
+    def test_matrix_matches_pairwise(self):
+        position_lists = [
+            [("tokenized_securities", "issuance")],
+            [],
+            [("capital_markets", "exit"), ("tokenized_securities", "custody")],
+            [("tokenized_securities", "issuance")],
+        ]
+        matrix = chain_score_matrix(position_lists)
+        assert matrix.shape == (4, 4)
+        for i, pa in enumerate(position_lists):
+            for j, pb in enumerate(position_lists):
+                assert matrix[i, j] == pytest.approx(best_chain_score(pa, pb))
+
 
 class TestTransactionMatrix:
     def test_investment(self):
@@ -87,6 +130,46 @@ class TestTransactionMatrix:
         tx = best_transaction_type(["other"], ["other"])
         assert tx is None
 
+    def test_role_order_independent(self):
+        a = best_transaction_type(
+            ["exploring_partnerships", "deploying_capital"], ["raising_capital"],
+        )
+        b = best_transaction_type(
+            ["deploying_capital", "exploring_partnerships"], ["raising_capital"],
+        )
+        assert a == b == "investment"
+
+    def test_unknown_role_ignored(self):
+        tx = best_transaction_type(["bogus", "deploying_capital"], ["raising_capital"])
+        assert tx == "investment"
+
+    def test_table_matches_matrix(self):
+        for (ra, rb), tx in ROLE_TRANSACTION_MATRIX.items():
+            code = TX_TABLE[ALL_ROLES.index(ra), ALL_ROLES.index(rb)]
+            assert TX_NAMES[code] == tx
+
+    def test_transaction_matrix_matches_pairwise(self):
+        role_lists = [
+            ["deploying_capital"],
+            ["raising_capital", "seeking_technology"],
+            ["seeking_technology", "raising_capital"],
+            ["other"],
+        ]
+        matrix = transaction_matrix(role_lists)
+        assert matrix.shape == (4, 4)
+        for i, ra in enumerate(role_lists):
+            for j, rb in enumerate(role_lists):
+                assert TX_NAMES[matrix[i, j]] == best_transaction_type(ra, rb)
+
+    def test_mask_table_matches_pairwise(self):
+        subsets = [
+            list(c) for r in range(3) for c in itertools.combinations(ALL_ROLES, r)
+        ]
+        matrix = transaction_matrix(subsets)
+        for i, ra in enumerate(subsets):
+            for j, rb in enumerate(subsets):
+                assert TX_NAMES[matrix[i, j]] == best_transaction_type(ra, rb)
+
 
 class TestStageCompatibility:
     def test_known_rule(self):
@@ -101,6 +184,14 @@ class TestStageCompatibility:
         s = stage_compatibility("investment", None, "series_b")
         assert s == 0.5
 
+    def test_cube_matches_rules(self):
+        stages = [*STAGE_NAMES, None, "", "unlisted"]
+        for code, tx in enumerate(TX_NAMES[1:], start=1):
+            for sa in stages:
+                for sb in stages:
+                    cube = STAGE_CUBE[code, stage_index(sa), stage_index(sb)]
+                    assert cube == pytest.approx(stage_compatibility(tx, sa, sb))
+
 
 class TestPositionTags:
     def test_tags_exist(self):
@@ -150,6 +241,23 @@ class TestNonObviousTagScore:
         if not shared:
             assert score == 0.0
 
+    def test_matrix_matches_pairwise(self):
+        position_lists = [
+            [("tokenized_securities", "issuance")],
+            [("tokenized_securities", "custody"), ("defi_infrastructure", "compliance")],
+            [("defi_infrastructure", "wallet_access")],
+            [],
+            [("institutional_adoption", "sandbox")],
+        ]
+        sectors = ["defi", "tradfi", None, "defi", "policy"]
+        matrix = tag_score_matrix(position_lists, sector_ids(sectors))
+        for i in range(len(sectors)):
+            for j in range(len(sectors)):
+                expected, _ = non_obvious_tag_score(
+                    position_lists[i], position_lists[j], sectors[i], sectors[j],
+                )
+                assert matrix[i, j] == pytest.approx(expected, abs=1e-6)
+
 
 class TestSharedProblemDomains:
     def test_overlap(self):
@@ -158,3 +266,17 @@ class TestSharedProblemDomains:
             [("defi_infrastructure", "compliance")],
         )
         assert "regulatory_compliance" in shared
+
+
+class TestInference:
+    def test_mandate_keyword_precedence(self):
+        # "partner" is listed ahead of "senior", so it wins regardless of
+        # where it appears in the title.
+        assert infer_mandate_score("Senior Partner") == 0.8
+
+    def test_mandate_unknown_title(self):
+        assert infer_mandate_score("Evangelist") == 0.5
+
+    def test_capability_order(self):
+        assert infer_capability("Head of Custody", "Invests in funds") == "capital_deployment"
+        assert infer_capability("Head of Custody", None) == "custody_settlement"
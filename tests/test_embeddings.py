@@ -0,0 +1,87 @@
+"""Unit tests for the embedding layer — runs with a stand-in encoder."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from src.matching import embeddings
+from src.matching.config import settings
+from src.matching.embeddings import EmbeddingStore
+
+
+class TestGetMatrix:
+    @pytest.fixture
+    def store(self, monkeypatch):
+        store = EmbeddingStore(maxsize=4)
+        monkeypatch.setattr(embeddings, "_store", store)
+        monkeypatch.setattr(
+            embeddings, "_encode",
+            lambda texts: np.array([[ord(t[0]), 1.0] for t in texts], dtype=np.float32),
+        )
+        return store
+
+    def test_misses_past_maxsize_keep_present_rows(self, store):
+        embeddings.fit(["a", "b", "c"])
+        matrix = embeddings.get_matrix(["a", "b", "x", "y"])
+        np.testing.assert_array_equal(matrix[:, 0], [ord("a"), ord("b"), ord("x"), ord("y")])
+        assert "c" not in store
+
+    def test_request_larger_than_maxsize(self, store):
+        embeddings.fit(["a", "b", "c"])
+        matrix = embeddings.get_matrix(["a", "b", "c", "x", "y"])
+        assert matrix.shape == (5, 2)
+        assert len(store) == 5
+
+    def test_fit_reads_back_from_disk_tier(self, store, disk_tier, monkeypatch):
+        embeddings.fit(["a", "b"])
+        encoded = []
+        monkeypatch.setattr(
+            embeddings, "_encode",
+            lambda texts: encoded.extend(texts) or np.ones((len(texts), 2), dtype=np.float32),
+        )
+        embeddings.fit(["a", "b", "c"])
+        assert encoded == ["c"]
+        np.testing.assert_array_equal(embeddings.get_matrix(["a"]), [[ord("a"), 1.0]])
+
+
+def test_disk_key_tracks_onnx_file(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_backend", "onnx")
+    monkeypatch.setattr(settings, "embedding_onnx_file", "onnx/a.onnx")
+    key_a = embeddings._disk_key("text")
+    monkeypatch.setattr(settings, "embedding_onnx_file", "onnx/b.onnx")
+    assert embeddings._disk_key("text") != key_a
+
+
+def test_onnx_backend_loads_configured_file(monkeypatch):
+    loaded = {}
+
+    class FakeSentenceTransformer:
+        def __init__(self, name, **kwargs):
+            loaded.update(kwargs, name=name)
+
+    monkeypatch.setitem(
+        sys.modules, "sentence_transformers",
+        types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer),
+    )
+    monkeypatch.setattr(embeddings, "_model", None)
+    monkeypatch.setattr(settings, "embedding_backend", "onnx")
+    embeddings._load_model()
+    assert loaded["backend"] == "onnx"
+    assert loaded["model_kwargs"] == {"file_name": "onnx/model_quint8_avx2.onnx"}
+
+
+class TestCosineSimilarity:
+    def test_matches_norm_based_form(self):
+        rng = np.random.default_rng(1)
+        for _ in range(5):
+            a, b = rng.normal(size=(2, 384))
+            expected = np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+            assert embeddings.cosine_similarity(a, b) == pytest.approx(expected, abs=1e-12)
+
+    def test_zero_vector_scores_zero(self):
+        assert embeddings.cosine_similarity(np.zeros(4), np.ones(4)) == 0.0
+        assert embeddings.cosine_similarity(np.zeros(4), np.zeros(4)) == 0.0
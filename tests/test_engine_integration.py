@@ -3,6 +3,9 @@
 import json
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 from src.matching.engine import DATA_DIR
 from src.matching.models import AttendeeProfile
 
@@ -38,3 +41,111 @@ def test_minimal_profile_has_product():
     profiles = [AttendeeProfile(**p) for p in raw]
     for p in profiles:
         assert p.product is not None
+
+
+def _pool() -> list[AttendeeProfile]:
+    from src.matching.engine import load_sample_profiles
+
+    extra = [
+        AttendeeProfile(
+            name=f"Extra {i}",
+            title=title,
+            company=f"Company {i}",
+            product=product,
+            sector=sector,
+            stage=stage,
+            key_facts=facts,
+        )
+        for i, (title, product, sector, stage, facts) in enumerate([
+            ("CEO", "Tokenization platform", "tokenized_securities", "series_b", ["Live with 3 banks"]),
+            ("General Partner", "Growth fund", "capital_markets", "growth_vc", []),
+            ("Head of Policy", "Central bank sandbox", None, "central_bank", ["Pilot partner"]),
+            ("Analyst", "Research desk", "defi_infrastructure", None, []),
+            ("VP Engineering", "L2 scaling protocol", "defi_infrastructure", "seed", ["Production deploy"]),
+        ])
+    ]
+    return load_sample_profiles() + extra
+
+
+def _reference_top_k(enriched, k):
+    """Brute-force ranking through the single-pair scoring APIs."""
+    from src.matching.models import DimensionScores
+    from src.matching.scoring import complementarity, non_obvious, transaction_readiness
+    from src.matching.scoring.composite import composite_score
+
+    ranked = {}
+    for a in enriched:
+        candidates = []
+        for b in enriched:
+            if a.id == b.id:
+                continue
+            tr, _ = transaction_readiness.score(a, b)
+            scores = DimensionScores(
+                complementarity=complementarity.score(a, b),
+                transaction_readiness=tr,
+                non_obvious=non_obvious.score(a, b),
+            )
+            candidates.append((composite_score(scores), b.id))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        ranked[a.id] = candidates[:k]
+    return ranked
+
+
+def test_run_matches_pairwise_reference(fake_embeddings, fake_client):
+    from src.matching.engine import run
+    from src.matching.extraction.intent_extractor import extract_all
+
+    profiles = _pool()
+    briefings = run(profiles, client=fake_client, top_k=3, skip_explanations=True)
+    enriched = [extract_all(fake_client, p) for p in profiles]
+    expected = _reference_top_k(enriched, 3)
+
+    assert len(briefings) == len(profiles)
+    for briefing in briefings:
+        got = [(m.pair.composite, m.pair.attendee_b_id) for m in briefing.matches]
+        want = expected[briefing.attendee_id]
+        assert [b_id for _, b_id in got] == [b_id for _, b_id in want]
+        for (g, _), (w, _) in zip(got, want):
+            assert g == pytest.approx(w, abs=1e-5)
+
+
+def test_top_k_indices_matches_stable_argsort():
+    from src.matching.engine import _top_k_indices
+
+    row = np.array([0.2, 0.5, -np.inf, 0.5, 0.1, 0.5, 0.3])
+    for k in range(1, 9):
+        expected = np.argsort(-row, kind="stable")[:k]
+        np.testing.assert_array_equal(_top_k_indices(row, k), expected)
+
+
+def test_explanations_follow_their_pair(fake_embeddings, fake_client):
+    from src.matching.engine import run
+
+    profiles = _pool()
+    names = {p.id: p.name for p in profiles}
+    briefings = run(profiles, client=fake_client, top_k=3)
+
+    for briefing in briefings:
+        for m in briefing.matches:
+            other = names[m.pair.attendee_b_id]
+            assert m.explanation == f"{briefing.attendee_name} -> {other}"
+            assert m.dimension_explanations.complementarity == other
+    assert len(fake_client.explained) == 3 * len(profiles)
+
+
+@pytest.mark.parametrize("explain_top", [0, 2])
+def test_explain_top_limits_llm_explanations(fake_embeddings, fake_client, explain_top):
+    from src.matching.engine import run
+
+    profiles = _pool()
+    names = {p.id: p.name for p in profiles}
+    briefings = run(profiles, client=fake_client, top_k=3, explain_top=explain_top)
+
+    for briefing in briefings:
+        for rank, m in enumerate(briefing.matches):
+            if rank < explain_top:
+                other = names[m.pair.attendee_b_id]
+                assert m.explanation == f"{briefing.attendee_name} -> {other}"
+            else:
+                assert m.explanation == "(explanations skipped)"
+    assert len(fake_client.explained) == explain_top * len(profiles)
@@ -0,0 +1,58 @@
+"""Unit tests for intent extraction caching — runs against FakeAnthropic."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.matching.engine import load_sample_profiles
+from src.matching.extraction import intent_extractor
+from src.matching.extraction.intent_extractor import extract_all
+from src.matching.models import AttendeeProfile
+
+
+def _offline_client() -> SimpleNamespace:
+    def create(**kwargs):
+        pytest.fail("extraction should have been served from cache")
+
+    return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+
+def test_extraction_reads_back_from_disk_tier(fake_client, disk_tier):
+    profile = load_sample_profiles()[0]
+    first = extract_all(fake_client, profile)
+    intent_extractor._cache.clear()  # drop the in-process tier only
+    assert extract_all(_offline_client(), profile) == first
+
+
+class TestProfileHash:
+    _BASE = dict(
+        name="Ada", title="CEO", company="Acme", product="Rails",
+        company_description="Settlement rails", stated_goal="Raise a Series A",
+        sector="defi", stage="seed", funding_raised="$2M",
+        key_facts=["Live with 3 banks"], roles_at_event=["raising_capital"],
+    )
+
+    def test_stable_for_equal_profiles(self):
+        a = AttendeeProfile(**self._BASE)
+        b = AttendeeProfile(**self._BASE)
+        assert intent_extractor._profile_hash(a) == intent_extractor._profile_hash(b)
+
+    @pytest.mark.parametrize("field, value", [
+        ("name", "Grace"),
+        ("title", "CFO"),
+        ("company", "Initech"),
+        ("product", "Custody"),
+        ("company_description", "Custody for funds"),
+        ("stated_goal", "Find LPs"),
+        ("sector", "tradfi"),
+        ("stage", "series_a"),
+        ("funding_raised", "$5M"),
+        ("key_facts", ["Live with 4 banks"]),
+        ("roles_at_event", ["deploying_capital"]),
+    ])
+    def test_changes_with_each_prompt_field(self, field, value):
+        base = intent_extractor._profile_hash(AttendeeProfile(**self._BASE))
+        changed = AttendeeProfile(**{**self._BASE, field: value})
+        assert intent_extractor._profile_hash(changed) != base
@@ -0,0 +1,49 @@
+"""Unit tests for the shared LLM call helpers — no network."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.matching.llm import _strip_fences, _system_blocks, call_llm_json
+
+
+class _RecordingClient:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.calls: list[dict] = []
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+_PAYLOAD = {"needs": {"primary_need": "capital"}, "roles_at_event": ["raising_capital"]}
+
+
+@pytest.mark.parametrize("raw", [
+    json.dumps(_PAYLOAD),
+    f"  {json.dumps(_PAYLOAD)}\n",
+    f"```json\n{json.dumps(_PAYLOAD)}\n```",
+    f"```\n{json.dumps(_PAYLOAD)}```",
+    f"Here you go:\n```json\n{json.dumps(_PAYLOAD, indent=2)}\n```\nDone.",
+])
+def test_fenced_and_unfenced_json_parse(raw):
+    assert json.loads(_strip_fences(raw)) == _PAYLOAD
+    assert call_llm_json(_RecordingClient(raw), "system", "user") == _PAYLOAD
+
+
+def test_non_json_response_returns_empty_dict():
+    assert call_llm_json(_RecordingClient("no json here"), "system", "user") == {}
+
+
+def test_system_prompt_is_marked_for_caching():
+    assert _system_blocks("prompt") == [
+        {"type": "text", "text": "prompt", "cache_control": {"type": "ephemeral"}},
+    ]
+    client = _RecordingClient("{}")
+    call_llm_json(client, "prompt", "user")
+    assert client.calls[0]["system"] == _system_blocks("prompt")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from src.matching.models import (
     AttendeeProfile,
     DimensionScores,
@@ -85,3 +87,91 @@ class TestTransactionReadiness:
         s, tx = score(a, b)
         assert s > 0.0
         assert tx == "investment"
+
+    def test_matrix_matches_pairwise(self):
+        from src.matching.domain_model import TX_CODES, transaction_matrix
+        from src.matching.profile_arrays import profile_roles
+        from src.matching.scoring import transaction_readiness
+
+        profiles = [
+            _make_profile("Investor", title="General Partner", roles=["deploying_capital"],
+                          sector="defi", provides="capital partner"),
+            _make_profile("Founder", title="CEO", roles=["raising_capital"],
+                          sector="defi", need="partner capital"),
+            _make_profile("Regulator", title="Director", roles=["regulatory_policy"],
+                          sector="policy"),
+            _make_profile("Builder", title="CTO", roles=["seeking_technology"]),
+            _make_profile("Lurker", roles=["other"]),
+        ]
+        profiles[0].stage = "growth_vc"
+        profiles[1].stage = "series_b"
+        profiles[0].provides_vector.geographic_reach = ["europe", "global"]
+        profiles[1].provides_vector.geographic_reach = ["europe"]
+        profiles[2].provides_vector.geographic_reach = ["global"]
+        profiles[3].provides_vector.geographic_reach = ["global", "apac"]
+        profiles[1].key_facts = ["live with 3 bank customers"]
+
+        tx = transaction_matrix([profile_roles(p) for p in profiles])
+        matrix = transaction_readiness.score_matrix(profiles, tx)
+        for i, a in enumerate(profiles):
+            for j, b in enumerate(profiles):
+                expected, tx_type = transaction_readiness.score(a, b)
+                assert tx[i, j] == (TX_CODES[tx_type] if tx_type else 0)
+                assert matrix[i, j] == pytest.approx(expected, abs=1e-5)
+
+
+class TestComplementarityMatrix:
+    def test_matches_pairwise_score(self, fake_embeddings):
+        from src.matching.scoring import complementarity
+
+        profiles = [
+            _make_profile("A", need="capital", provides="custody", sector="x"),
+            _make_profile("B", need="custody", provides="capital", sector="y"),
+            _make_profile("C", need="distribution", provides="compliance"),
+        ]
+        profiles[0].value_chain_positions = [("tokenized_securities", "issuance")]
+        profiles[1].value_chain_positions = [("tokenized_securities", "custody")]
+
+        matrix = complementarity.score_matrix(profiles)
+        for i, a in enumerate(profiles):
+            for j, b in enumerate(profiles):
+                if i != j:
+                    assert matrix[i, j] == pytest.approx(complementarity.score(a, b), abs=1e-5)
+
+
+class TestNonObviousTfidfMatrix:
+    def test_matches_pairwise_score(self, fake_embeddings, monkeypatch):
+        from src.matching.config import settings
+        from src.matching.scoring import non_obvious_tfidf
+
+        # Low threshold so the cross-sector boost path is exercised too.
+        monkeypatch.setattr(settings, "novelty_similarity_threshold", -1.0)
+        profiles = [
+            _make_profile("A", need="capital", sector="x"),
+            _make_profile("B", need="custody", sector="y"),
+            _make_profile("C", need="distribution"),
+            _make_profile("D", need="compliance", sector="x"),
+        ]
+
+        matrix = non_obvious_tfidf.score_matrix(profiles)
+        for i, a in enumerate(profiles):
+            for j, b in enumerate(profiles):
+                assert matrix[i, j] == pytest.approx(non_obvious_tfidf.score(a, b), abs=1e-5)
+
+
+class TestProfileArrays:
+    def test_columns_follow_profile_order(self):
+        from src.matching.profile_arrays import ProfileArrays
+
+        profiles = [
+            _make_profile("A", title="CEO", sector="defi"),
+            _make_profile("B", title="Analyst"),
+            _make_profile("C", title="CFO", sector="defi", provides="Custody Rails"),
+            _make_profile("D", title="CEO", sector=""),
+        ]
+        arrays = ProfileArrays.from_profiles(profiles)
+        assert len(arrays) == 4
+        assert arrays.authority.tolist() == pytest.approx([0.95, 0.3, 0.9, 0.95])
+        assert arrays.sector_id.tolist() == [0, -1, 0, -1]
+        assert arrays.urgency_bonus.tolist() == pytest.approx([0.05] * 4)
+        assert arrays.cap_words[2] == frozenset({"custody", "rails"})